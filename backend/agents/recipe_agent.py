@@ -7,10 +7,12 @@ with the AG-UI adapter for shared state management.
 
 from enum import Enum
 
-from agent_framework import ChatAgent, ChatClientProtocol, ai_function
+from agent_framework import ChatAgent, ChatClientProtocol
 from agent_framework.ag_ui import AgentFrameworkAgent, RecipeConfirmationStrategy
 from pydantic import BaseModel, Field
 
+from .tools import fixed_schema_ai_function
+
 
 class SkillLevel(str, Enum):
     """The skill level required for the recipe."""
@@ -47,7 +49,7 @@ class Recipe(BaseModel):
     instructions: list[str] = Field(..., description="Step-by-step cooking instructions")
 
 
-@ai_function
+@fixed_schema_ai_function
 def update_recipe(recipe: Recipe) -> str:
     """Update the recipe with new or modified content.
 
@@ -64,6 +66,15 @@ def update_recipe(recipe: Recipe) -> str:
     return "Recipe updated."
 
 
+_RECIPE_STATE_SCHEMA = {
+    "recipe": {"type": "object", "description": "The current recipe"},
+}
+
+_RECIPE_PREDICT_STATE_CONFIG = {
+    "recipe": {"tool": "update_recipe", "tool_argument": "recipe"},
+}
+
+
 _RECIPE_INSTRUCTIONS = """Eres un chef apasionado y divertido que ADORA ayudar a la gente a cocinar. 
 Tu nombre es Chef Pixel 👨‍🍳 y tienes una personalidad alegre y entusiasta.
 
@@ -122,18 +133,22 @@ SIEMPRE responde en español y con MÁXIMO 2 oraciones después de la herramient
 """
 
 
-def recipe_agent(chat_client: ChatClientProtocol) -> AgentFrameworkAgent:
+def recipe_agent(
+    chat_client: ChatClientProtocol,
+    instructions: str = _RECIPE_INSTRUCTIONS,
+) -> AgentFrameworkAgent:
     """Create a recipe agent with streaming state updates.
 
     Args:
         chat_client: The chat client to use for the agent
+        instructions: System prompt for the agent (defaults to Chef Pixel)
 
     Returns:
         A configured AgentFrameworkAgent instance with recipe management
     """
     agent = ChatAgent(
         name="recipe_agent",
-        instructions=_RECIPE_INSTRUCTIONS,
+        instructions=instructions,
         chat_client=chat_client,
         tools=[update_recipe],
     )
@@ -142,12 +157,8 @@ def recipe_agent(chat_client: ChatClientProtocol) -> AgentFrameworkAgent:
         agent=agent,
         name="RecipeAgent",
         description="Crea y modifica recetas con actualizaciones de estado en streaming",
-        state_schema={
-            "recipe": {"type": "object", "description": "The current recipe"},
-        },
-        predict_state_config={
-            "recipe": {"tool": "update_recipe", "tool_argument": "recipe"},
-        },
+        state_schema=_RECIPE_STATE_SCHEMA,
+        predict_state_config=_RECIPE_PREDICT_STATE_CONFIG,
         confirmation_strategy=RecipeConfirmationStrategy(),
         require_confirmation=False,
     )
@@ -5,13 +5,20 @@ This module implements a theme personalization agent for the Ilitia demo
 using the AG-UI adapter for shared state management.
 """
 
-from agent_framework import ChatAgent, ChatClientProtocol, ai_function
+from typing import Final
+
+from agent_framework import ChatAgent, ChatClientProtocol
 from agent_framework.ag_ui import AgentFrameworkAgent, RecipeConfirmationStrategy
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .tools import fixed_schema_ai_function
 
 
 class Theme(BaseModel):
     """Theme configuration for page personalization."""
+    # Tool arguments are only read, never mutated
+    model_config = ConfigDict(frozen=True)
+
     primary_color: str = Field(..., description="Primary color in hex format (e.g., #667eea)")
     secondary_color: str = Field(..., description="Secondary color for gradients in hex format")
     background_color: str = Field(..., description="Page background color in hex format")
@@ -26,7 +33,7 @@ class Theme(BaseModel):
     background_image: str = Field(default="", description="URL to a background image for the hero section (optional, from Unsplash)")
 
 
-@ai_function
+@fixed_schema_ai_function
 def update_theme(theme: Theme) -> str:
     """Update the page theme with new colors, emojis, and styling.
 
@@ -47,7 +54,16 @@ def update_theme(theme: Theme) -> str:
     return "Theme updated."
 
 
-_THEME_INSTRUCTIONS = """Eres un diseñador experto en personalización visual de páginas web.
+_THEME_STATE_SCHEMA = {
+    "theme": {"type": "object", "description": "The current theme configuration"},
+}
+
+_THEME_PREDICT_STATE_CONFIG = {
+    "theme": {"tool": "update_theme", "tool_argument": "theme"},
+}
+
+
+_THEME_INSTRUCTIONS: Final[str] = """Eres un diseñador experto en personalización visual de páginas web.
 
 Tu trabajo es cambiar el tema visual de una página web según las preferencias del usuario.
 La página es de Ilitia, una empresa de tecnología e inteligencia artificial.
@@ -123,12 +139,8 @@ def theme_agent(chat_client: ChatClientProtocol) -> AgentFrameworkAgent:
         agent=agent,
         name="ThemeAgent",
         description="Personaliza el tema visual de la página según las preferencias del usuario",
-        state_schema={
-            "theme": {"type": "object", "description": "The current theme configuration"},
-        },
-        predict_state_config={
-            "theme": {"tool": "update_theme", "tool_argument": "theme"},
-        },
+        state_schema=_THEME_STATE_SCHEMA,
+        predict_state_config=_THEME_PREDICT_STATE_CONFIG,
         confirmation_strategy=RecipeConfirmationStrategy(),
         require_confirmation=False,
     )
@@ -0,0 +1,32 @@
+"""
+Helpers shared by the agents' tool definitions
+"""
+
+import copy
+from typing import Any, Callable
+
+from agent_framework import AIFunction
+
+
+class FixedSchemaAIFunction(AIFunction):
+    """
+    AIFunction whose parameter schema is generated once, at definition time.
+
+    The stock parameters() rebuilds the JSON schema from the input model on
+    every request. Chat clients edit the schema they get in place (the OpenAI
+    Responses client sets additionalProperties, for one), so every call gets
+    its own copy of the cached schema.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._parameters_schema = self.input_model.model_json_schema()
+
+    def parameters(self) -> dict[str, Any]:
+        """A fresh copy of the JSON schema of the parameters"""
+        return copy.deepcopy(self._parameters_schema)
+
+
+def fixed_schema_ai_function(func: Callable[..., Any]) -> FixedSchemaAIFunction:
+    """Like @ai_function (name and description from the function), with a cached schema"""
+    return FixedSchemaAIFunction(name=func.__name__, description=func.__doc__ or "", func=func)
@@ -0,0 +1,216 @@
+"""
+AG-UI SSE Endpoint for Microsoft Agent Framework agents
+
+Drop-in replacement for agent_framework.ag_ui.add_agent_framework_fastapi_endpoint
+tuned for the streaming hot path: each event is serialized exactly once by
+pydantic-core, without the per-event model_dump() and f-string debug logging
+the stock endpoint performs for every token.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator
+
+from agent_framework.ag_ui import AgentFrameworkAgent
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# SSE framing as bytes so frames go to the socket without a str -> bytes re-encode
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+# Parses the raw request body in a single pass (jiter) straight into the dict
+# AgentFrameworkAgent.run_agent expects, rejecting non-object payloads up front
+_RUN_INPUT_ADAPTER = TypeAdapter(dict[str, Any])
+_BATCH_INPUT_ADAPTER = TypeAdapter(list[dict[str, Any]])
+
+# Frames produced within this window (or until the buffer fills) are sent as a
+# single chunk; SSE frames are "\n\n"-delimited so concatenating them is valid
+_COALESCE_WINDOW = 0.003  # seconds
+_COALESCE_MAX_BYTES = 4096
+
+_END_OF_STREAM = object()
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+async def _pump(frames: AsyncIterator[bytes], queue: asyncio.Queue) -> None:
+    """Feed frames into queue, followed by the end marker or the raised exception"""
+    try:
+        async for frame in frames:
+            await queue.put(frame)
+    except Exception as e:
+        await queue.put(e)
+    else:
+        await queue.put(_END_OF_STREAM)
+
+
+async def coalesce_frames(frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Merge SSE frames that arrive within a few milliseconds into one chunk.
+    
+    Token streams produce hundreds of tiny frames per second; batching them
+    means fewer send() calls and TCP/TLS records while adding at most
+    _COALESCE_WINDOW of latency. Errors from the source are re-raised here.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+    pump = asyncio.create_task(_pump(frames, queue))
+    pending: Any = None
+    try:
+        while True:
+            item = pending if pending is not None else await queue.get()
+            pending = None
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, Exception):
+                raise item
+
+            buffer = bytearray(item)
+            deadline = loop.time() + _COALESCE_WINDOW
+            while len(buffer) < _COALESCE_MAX_BYTES:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        # Queue.get is cancellation-safe: a timed-out get never drops an item
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except TimeoutError:
+                        break
+                if not isinstance(item, bytes):
+                    pending = item
+                    break
+                buffer += item
+            yield bytes(buffer)
+    finally:
+        pump.cancel()
+
+
+def add_agui_endpoint(app: FastAPI, agent: AgentFrameworkAgent, path: str) -> None:
+    """Register a POST endpoint at `path` that streams `agent` events as SSE.
+
+    Args:
+        app: The FastAPI application
+        agent: The AG-UI wrapped agent to expose
+        path: The endpoint path
+    """
+
+    @app.post(path)
+    async def agent_endpoint(request: Request):
+        """Run the agent for an AG-UI RunAgentInput payload and stream its events"""
+        try:
+            input_data = _RUN_INPUT_ADAPTER.validate_json(await request.body())
+        except ValidationError as e:
+            logger.warning("Invalid AG-UI request at %s: %s", path, e)
+            return JSONResponse({"error": "Invalid AG-UI request body."}, status_code=400)
+
+        logger.info("Received request at %s: %s", path, input_data.get("run_id", "no-run-id"))
+
+        async def event_stream():
+            event_count = 0
+            async for event in agent.run_agent(input_data):
+                event_count += 1
+                # pydantic-core writes UTF-8 JSON bytes directly; events omit unset
+                # optional fields themselves (ag_ui ConfiguredBaseModel)
+                yield _SSE_PREFIX + event.__pydantic_serializer__.to_json(event, by_alias=True) + _SSE_SUFFIX
+            logger.info("[%s] Completed streaming %d events", path, event_count)
+
+        return StreamingResponse(
+            coalesce_frames(event_stream()),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS,
+        )
+
+
+def add_agui_batch_endpoint(
+    app: FastAPI,
+    agent: AgentFrameworkAgent,
+    path: str,
+    concurrency: int = 8,
+    max_batch_size: int = 32,
+) -> None:
+    """Register a POST endpoint at `path` that runs a list of AG-UI inputs concurrently.
+
+    The body is a JSON array of RunAgentInput payloads. Runs share the agent
+    (and its chat client); at most `concurrency` are in flight at once, and
+    requests with more than `max_batch_size` inputs are rejected with 413. The
+    response is NDJSON with one line per run, in completion order:
+    {"index": <position in the request>, "events": [...]} or
+    {"index": ..., "error": "..."}.
+
+    Args:
+        app: The FastAPI application
+        agent: The AG-UI wrapped agent to expose
+        path: The endpoint path
+        concurrency: Maximum number of runs executing at the same time
+        max_batch_size: Maximum number of inputs accepted in one request
+
+    Raises:
+        ValueError: If concurrency or max_batch_size is less than 1
+    """
+    # With no workers, result_stream would wait on its queue forever
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    if max_batch_size < 1:
+        raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+
+    @app.post(path)
+    async def batch_endpoint(request: Request):
+        """Run several AG-UI payloads against the agent and stream their results as NDJSON"""
+        try:
+            inputs = _BATCH_INPUT_ADAPTER.validate_json(await request.body())
+        except ValidationError as e:
+            logger.warning("Invalid AG-UI batch request at %s: %s", path, e)
+            return JSONResponse({"error": "Invalid AG-UI batch request body."}, status_code=400)
+
+        if len(inputs) > max_batch_size:
+            logger.warning("Rejected batch of %d runs at %s (max %d)", len(inputs), path, max_batch_size)
+            return JSONResponse(
+                {"error": f"Batch too large: at most {max_batch_size} runs per request."},
+                status_code=413,
+            )
+
+        logger.info("Received batch of %d runs at %s", len(inputs), path)
+
+        async def run_one(index: int, input_data: dict[str, Any]) -> bytes:
+            try:
+                # Events are encoded as they arrive so only their bytes are held
+                encoded = [
+                    event.__pydantic_serializer__.to_json(event, by_alias=True)
+                    async for event in agent.run_agent(input_data)
+                ]
+            except Exception as e:
+                logger.error("Batch run %d at %s failed: %s", index, path, e, exc_info=True)
+                return b'{"index":%d,"error":"An internal error has occurred."}\n' % index
+            return b'{"index":%d,"events":[%s]}\n' % (index, b",".join(encoded))
+
+        async def result_stream():
+            # A fixed pool of workers pulls inputs one at a time, so runs start
+            # only as earlier ones finish; the bounded queue makes workers wait
+            # for the client to read finished results before starting more
+            pending = iter(enumerate(inputs))
+            results: asyncio.Queue[bytes] = asyncio.Queue(maxsize=concurrency)
+
+            async def worker() -> None:
+                for index, input_data in pending:
+                    await results.put(await run_one(index, input_data))
+
+            workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(inputs)))]
+            try:
+                for _ in range(len(inputs)):
+                    yield await results.get()
+            finally:
+                for task in workers:
+                    task.cancel()
+
+        return StreamingResponse(result_stream(), media_type="application/x-ndjson")
@@ -5,53 +5,99 @@ Uses Microsoft Agent Framework with AG-UI adapter for proper integration.
 Provides endpoints for Recipe and Theme agents.
 """
 
+import json
+import logging
 import os
+import queue
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from agent_framework.ag_ui import add_agent_framework_fastapi_endpoint
-from agent_framework.openai import OpenAIChatClient
-
 from agents.recipe_agent import recipe_agent
 from agents.theme_agent import theme_agent
+from agui_endpoint import add_agui_batch_endpoint, add_agui_endpoint
 
 # Load environment variables
 load_dotenv()
 
-
+# Chat model configuration, resolved once at import
+AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
+AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
+AZURE_OPENAI_CHAT_DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME", "gpt-4o")
+AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+
+# Maximum concurrent runs per /shared_state/batch request
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 8))
+# Maximum runs accepted in one /batch request (larger ones get a 413)
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 32))
+
+logger = logging.getLogger("agui")
+
+
+def start_log_listener() -> tuple[QueueHandler, QueueListener]:
+    """
+    Route log records through a queue to a background writer thread.
+    
+    Handlers on the event loop thread only enqueue records, so logging from
+    request handlers never blocks on a stderr flush.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    queue_handler = QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return queue_handler, listener
+
+
+@lru_cache(maxsize=1)
 def get_chat_client():
-    """Create OpenAI/Azure chat client based on configuration"""
+    """Create OpenAI/Azure chat client based on configuration (built once per process)"""
     # Check for Azure OpenAI first
-    azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-
-    if azure_endpoint:
+    if AZURE_OPENAI_ENDPOINT:
         from agent_framework.azure import AzureOpenAIChatClient
 
         return AzureOpenAIChatClient(
-            endpoint=azure_endpoint,
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            deployment_name=os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME", "gpt-4o"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+            endpoint=AZURE_OPENAI_ENDPOINT,
+            api_key=AZURE_OPENAI_API_KEY,
+            deployment_name=AZURE_OPENAI_CHAT_DEPLOYMENT_NAME,
+            api_version=AZURE_OPENAI_API_VERSION,
         )
 
-    # Default to OpenAI
+    # Default to OpenAI (imported lazily, like the Azure client, so only the
+    # configured provider's module is loaded)
+    from agent_framework.openai import OpenAIChatClient
+
     return OpenAIChatClient(
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model_id=os.getenv("OPENAI_MODEL", "gpt-4o"),
+        api_key=OPENAI_API_KEY,
+        model_id=OPENAI_MODEL,
     )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
-    print("🚀 Starting AG-UI Demos Backend (Microsoft Agent Framework)...")
-    print("   📍 Recipe Agent: /shared_state")
-    print("   📍 Theme Agent:  /theme_state")
-    yield
-    print("👋 Shutting down AG-UI Demos Backend...")
+    queue_handler, listener = start_log_listener()
+    logger.info("🚀 Starting AG-UI Demos Backend (Microsoft Agent Framework)...")
+    logger.info("   📍 Recipe Agent: %s (batch: %s)", "/shared_state", "/shared_state/batch")
+    logger.info("   📍 Theme Agent:  %s", "/theme_state")
+    try:
+        yield
+    finally:
+        logger.info("👋 Shutting down AG-UI Demos Backend...")
+        listener.stop()
+        logging.getLogger().removeHandler(queue_handler)
 
 
 app = FastAPI(
@@ -61,10 +107,17 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# CORS for frontend
+# CORS for frontend: explicit origins keep the middleware on its simple
+# membership check (a "*" wildcard with credentials echoes the origin per request)
+CORS_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -73,37 +126,64 @@ app.add_middleware(
 # Create chat client
 chat_client = get_chat_client()
 
-# Register Recipe Agent endpoint
-recipe_ag = recipe_agent(chat_client)
-add_agent_framework_fastapi_endpoint(app, recipe_ag, "/shared_state")
+# Agent registry: endpoint path -> agent factory. Every agent shares the one chat client.
+AGENTS = {
+    "/shared_state": recipe_agent,  # Recipe Agent
+    "/theme_state": theme_agent,  # Theme Agent
+}
+
+# Paths that also get a concurrent /batch endpoint
+BATCH_AGENT_PATHS = ("/shared_state",)
+
+agents = {path: factory(chat_client) for path, factory in AGENTS.items()}
+for path, agent in agents.items():
+    add_agui_endpoint(app, agent, path)
+    if path in BATCH_AGENT_PATHS:
+        add_agui_batch_endpoint(
+            app,
+            agent,
+            f"{path}/batch",
+            concurrency=BATCH_CONCURRENCY,
+            max_batch_size=BATCH_MAX_SIZE,
+        )
+
+
+def _encode_static_json(content: dict) -> bytes:
+    """Encode a constant response body once, matching FastAPI's JSONResponse output"""
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Static bodies are serialized once at import; probes and info requests just send bytes
+_HEALTH_BODY = _encode_static_json(
+    {"status": "healthy", "service": "agui-demos", "framework": "microsoft-agent-framework"}
+)
 
-# Register Theme Agent endpoint
-theme_ag = theme_agent(chat_client)
-add_agent_framework_fastapi_endpoint(app, theme_ag, "/theme_state")
+_ROOT_BODY = _encode_static_json({
+    "name": "AG-UI Demos API",
+    "version": "2.0.0",
+    "framework": "Microsoft Agent Framework",
+    "protocol": "AG-UI",
+    "agents": {
+        "recipe": "/shared_state - Recipe generation agent",
+        "recipe_batch": "/shared_state/batch - Run several recipe requests concurrently (NDJSON)",
+        "theme": "/theme_state - Theme personalization agent",
+    },
+    "endpoints": {
+        "health": "/health - Health check",
+    },
+})
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "agui-demos", "framework": "microsoft-agent-framework"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/")
 async def root():
     """Root endpoint with API info"""
-    return {
-        "name": "AG-UI Demos API",
-        "version": "2.0.0",
-        "framework": "Microsoft Agent Framework",
-        "protocol": "AG-UI",
-        "agents": {
-            "recipe": "/shared_state - Recipe generation agent",
-            "theme": "/theme_state - Theme personalization agent",
-        },
-        "endpoints": {
-            "health": "/health - Health check",
-        },
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -111,10 +191,19 @@ if __name__ == "__main__":
 
     port = int(os.getenv("PORT", 8888))
     host = os.getenv("HOST", "0.0.0.0")
+    # Auto-reload is a development convenience (file watcher + single process);
+    # it takes precedence over WORKERS when enabled.
+    reload = os.getenv("RELOAD", "false").lower() in ("1", "true", "yes")
+    workers = int(os.getenv("WORKERS", 1))
 
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
-        reload=True,
+        # uvloop/httptools come with uvicorn[standard]; "auto" falls back to
+        # asyncio/h11 where they are unavailable (e.g. Windows)
+        loop="auto",
+        http="auto",
+        reload=reload,
+        workers=None if reload else workers,
     )
@@ -35,19 +35,29 @@ STYLES = """
     scroll-behavior: smooth;
 }
 
-/* Loading dots animation */
-@keyframes bounce {
-    0%, 80%, 100% { transform: translateY(0); opacity: 0.5; }
-    40% { transform: translateY(-6px); opacity: 1; }
+/* Recipe chat scroller on its own compositor layer; containment keeps
+   bubble repaints while streaming from invalidating the rest of the page */
+#chat-messages {
+    contain: layout paint style;
+    will-change: transform;
 }
 
-.loading-dot {
-    animation: bounce 1.4s infinite ease-in-out both;
+/* Loading dots: three bouncing dots drawn as background layers of a single element */
+.loading-dots {
+    width: 36px;
+    height: 16px;
+    --dot: no-repeat radial-gradient(circle closest-side, #888 90%, #0000);
+    background: var(--dot) 0% 50%, var(--dot) 50% 50%, var(--dot) 100% 50%;
+    background-size: 12px 8px;
+    animation: loading-dots 1.2s infinite linear;
 }
 
-.dot-1 { animation-delay: -0.32s; }
-.dot-2 { animation-delay: -0.16s; }
-.dot-3 { animation-delay: 0s; }
+@keyframes loading-dots {
+    20% { background-position: 0% 0%, 50% 50%, 100% 50%; }
+    40% { background-position: 0% 100%, 50% 0%, 100% 50%; }
+    60% { background-position: 0% 50%, 50% 100%, 100% 0%; }
+    80% { background-position: 0% 50%, 50% 50%, 100% 100%; }
+}
 
 /* Animations */
 @keyframes fadeIn {
@@ -58,6 +68,37 @@ STYLES = """
 .message-bubble {
     animation: fadeIn 0.3s ease-out;
 }
+
+/* Chat bubble variants by message role */
+.bubble-user { justify-content: flex-end; }
+.bubble-assistant { justify-content: flex-start; }
+
+.bubble-user > .bubble-body {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border-bottom-right-radius: var(--bubble-tail-radius);
+}
+
+.bubble-assistant > .bubble-body {
+    background: #f5f5f5;
+    color: black;
+    border-bottom-left-radius: var(--bubble-tail-radius);
+}
+
+#theme-chat-messages .bubble-user > .bubble-body {
+    background: var(--ilitia-gradient);
+}
+
+/* Chat windowing: bubbles scrolled out of view skip layout and paint, so a
+   long history costs O(visible) per new message. The intrinsic size reserves
+   the bubble's last rendered height (~58px before first render) to keep the
+   scrollbar stable. content-visibility also clips paint to the row, so the
+   clip margin leaves room for the bubble shadow (up to 10px). */
+.message-bubble {
+    content-visibility: auto;
+    contain-intrinsic-size: auto 58px;
+    overflow-clip-margin: 10px;
+}
 """
 
 
@@ -68,7 +109,9 @@ app = rx.App(
     },
     stylesheets=[
         "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap",
+        "/ilitia.css",
     ],
+    head_components=[rx.el.style(STYLES)],
 )
 
 # Add pages
@@ -1,11 +1,20 @@
 """
 Recipe demo components.
+
+Submodules are imported on first attribute access (PEP 562), so components
+a page doesn't use - and the rx.memo components they define - are never
+loaded or compiled into the app.
 """
 
-from .recipe_form import recipe_form
-from .recipe_card import recipe_card
-from .floating_chat import floating_chat
-from .ingredients import ingredient_badge
+import importlib
+
+# Public name -> submodule that defines it
+_COMPONENT_MODULES = {
+    "recipe_form": "recipe_form",
+    "recipe_card": "recipe_card",
+    "floating_chat": "floating_chat",
+    "ingredient_badge": "ingredients",
+}
 
 __all__ = [
     "recipe_form",
@@ -13,3 +22,14 @@ __all__ = [
     "floating_chat",
     "ingredient_badge",
 ]
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _COMPONENT_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
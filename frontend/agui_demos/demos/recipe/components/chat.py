@@ -6,87 +6,113 @@ Chat UI for interacting with the recipe agent.
 
 import reflex as rx
 
+from ....shared.markdown import chat_markdown, markdown_block
 from ..state import RecipeState, ChatMessage
 
+# Static style values shared by the components below
+_BRAND_GRADIENT = "linear-gradient(135deg, #667eea 0%, #764ba2 100%)"
+_BUBBLE_TAIL_STYLE = {"--bubble-tail-radius": "0.25rem"}
+_BUBBLE_SHADOW = "0 2px 8px rgba(0,0,0,0.08)"
+_SEND_HOVER = {"opacity": "0.9"}
 
+
+@rx.memo
 def message_bubble(message: ChatMessage) -> rx.Component:
     """
     A single message bubble in the chat.
     
     User messages are aligned right with a blue background.
     Assistant messages are aligned left with a gray background.
-    """
-    is_user = message.role == "user"
     
+    Memoized so that only bubbles whose message changed re-render while
+    new tokens stream in.
+    """
     return rx.box(
         rx.box(
-            rx.markdown(
-                message.content,
-                class_name="message-content",
-            ),
-            background=rx.cond(
-                message.role == "user",
-                "linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
-                "#f5f5f5"
+            rx.cond(
+                message.has_markdown,
+                chat_markdown(
+                    message.content,
+                    class_name="message-content",
+                ),
+                rx.text(
+                    message.content,
+                    class_name="message-content",
+                    white_space="pre-wrap",
+                ),
             ),
-            color=rx.cond(message.role == "user", "white", "black"),
             padding="0.75rem 1rem",
             border_radius="1rem",
-            border_bottom_right_radius=rx.cond(message.role == "user", "0.25rem", "1rem"),
-            border_bottom_left_radius=rx.cond(message.role == "user", "1rem", "0.25rem"),
             max_width="85%",
-            box_shadow="0 2px 8px rgba(0,0,0,0.08)",
+            box_shadow=_BUBBLE_SHADOW,
+            class_name="bubble-body",
+            style=_BUBBLE_TAIL_STYLE,
         ),
         display="flex",
-        justify_content=rx.cond(message.role == "user", "flex-end", "flex-start"),
         width="100%",
+        # Role colors, alignment and the tail corner come from the
+        # .bubble-user / .bubble-assistant rules in the app stylesheet
+        class_name=f"message-bubble bubble-{message.role}",
         padding_y="0.25rem",
     )
 
 
-def streaming_indicator() -> rx.Component:
-    """Show streaming content while the agent is responding"""
-    return rx.cond(
-        RecipeState.is_streaming,
+def streaming_bubble(content: rx.Component) -> rx.Component:
+    """Assistant-style bubble holding the response being streamed"""
+    return rx.box(
         rx.box(
-            rx.box(
-                rx.cond(
-                    RecipeState.current_streaming_content != "",
-                    rx.markdown(RecipeState.current_streaming_content),
-                    rx.hstack(
-                        rx.spinner(size="1"),
-                        rx.text("Pensando...", color="gray", font_size="0.9rem"),
-                        spacing="2",
-                    ),
-                ),
-                background="#f5f5f5",
-                padding="0.75rem 1rem",
-                border_radius="1rem",
-                border_bottom_left_radius="0.25rem",
-                max_width="85%",
-                box_shadow="0 2px 8px rgba(0,0,0,0.08)",
-            ),
-            display="flex",
-            justify_content="flex-start",
-            width="100%",
-            padding_y="0.25rem",
+            content,
+            background="#f5f5f5",
+            padding="0.75rem 1rem",
+            border_radius="1rem",
+            border_bottom_left_radius="0.25rem",
+            max_width="85%",
+            box_shadow=_BUBBLE_SHADOW,
         ),
-        rx.fragment(),
+        display="flex",
+        justify_content="flex-start",
+        width="100%",
+        padding_y="0.25rem",
+    )
+
+
+def streaming_content() -> rx.Component:
+    """The streamed response so far"""
+    return rx.fragment(
+        rx.foreach(RecipeState.streaming_blocks, lambda block: markdown_block(source=block)),
+        # The growing tail is plain text; it is parsed once it completes a block
+        rx.text(RecipeState.streaming_tail, white_space="pre-wrap"),
+    )
+
+
+def thinking_indicator() -> rx.Component:
+    """Spinner shown while streaming has started but no text has arrived"""
+    return rx.hstack(
+        rx.spinner(size="1"),
+        rx.text("Pensando...", color="gray", font_size="0.9rem"),
+        spacing="2",
     )
 
 
 def loading_indicator() -> rx.Component:
-    """Show loading indicator when waiting for agent"""
-    return rx.cond(
-        RecipeState.is_loading & ~RecipeState.is_streaming,
-        rx.center(
-            rx.hstack(
-                rx.spinner(size="2"),
-                rx.text("Conectando con el chef...", color="gray"),
-                spacing="2",
-            ),
-            padding="1rem",
+    """Loading indicator shown while waiting for the agent"""
+    return rx.center(
+        rx.hstack(
+            rx.spinner(size="2"),
+            rx.text("Conectando con el chef...", color="gray"),
+            spacing="2",
         ),
+        padding="1rem",
+    )
+
+
+def activity_indicator() -> rx.Component:
+    """Show the streaming response or a loading state, switching once on chat_status"""
+    return rx.match(
+        RecipeState.chat_status,
+        ("streaming_content", streaming_bubble(streaming_content())),
+        ("streaming_waiting", streaming_bubble(thinking_indicator())),
+        ("loading", loading_indicator()),
         rx.fragment(),
     )
 
@@ -123,9 +149,9 @@ def chat_input() -> rx.Component:
             disabled=RecipeState.is_loading,
             size="3",
             radius="full",
-            background="linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
+            background=_BRAND_GRADIENT,
             cursor="pointer",
-            _hover={"opacity": "0.9"},
+            _hover=_SEND_HOVER,
         ),
         spacing="2",
         width="100%",
@@ -161,8 +187,7 @@ def chat_interface() -> rx.Component:
     
     Includes:
     - Message history
-    - Streaming indicator
-    - Loading indicator
+    - Streaming/loading indicator
     - Error display
     - Input field
     """
@@ -175,9 +200,8 @@ def chat_interface() -> rx.Component:
             rx.cond(
                 RecipeState.message_count > 0,
                 rx.vstack(
-                    rx.foreach(RecipeState.messages, message_bubble),
-                    streaming_indicator(),
-                    loading_indicator(),
+                    rx.foreach(RecipeState.messages, lambda message: message_bubble(message=message, key=message.id)),
+                    activity_indicator(),
                     spacing="2",
                     align="start",
                     width="100%",
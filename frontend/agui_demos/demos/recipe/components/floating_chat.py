@@ -6,113 +6,118 @@ A floating chat button and panel that can be toggled open/closed.
 
 import reflex as rx
 
+from ....shared.markdown import chat_markdown, markdown_block
 from ..state import RecipeState, ChatMessage
 
+# Static style values shared by the components below
+_BRAND_GRADIENT = "linear-gradient(135deg, #667eea 0%, #764ba2 100%)"
+_BUBBLE_TAIL_STYLE = {"--bubble-tail-radius": "0.2rem"}
+_BUBBLE_SHADOW = "0 1px 4px rgba(0,0,0,0.06)"
+_BUTTON_HOVER = {
+    "transform": "scale(1.05)",
+    "box_shadow": "0 6px 25px rgba(102, 126, 234, 0.5)",
+}
+# Only the hover-animated properties; transform stays on the compositor
+_TRANSITION_STYLE = {"transition": "transform 0.2s ease, box-shadow 0.2s ease", "will_change": "transform"}
 
-def message_bubble(message: ChatMessage) -> rx.Component:
-    """A single message bubble in the chat"""
+
+@rx.memo
+def floating_message_bubble(message: ChatMessage) -> rx.Component:
+    """A single message bubble in the chat (memoized: re-renders only when its message changes)"""
     return rx.box(
         rx.box(
-            rx.markdown(
-                message.content,
-                class_name="message-content",
-            ),
-            background=rx.cond(
-                message.role == "user",
-                "linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
-                "#f5f5f5"
+            rx.cond(
+                message.has_markdown,
+                chat_markdown(
+                    message.content,
+                    class_name="message-content",
+                ),
+                rx.text(
+                    message.content,
+                    class_name="message-content",
+                    white_space="pre-wrap",
+                ),
             ),
-            color=rx.cond(message.role == "user", "white", "black"),
             padding="0.6rem 0.9rem",
             border_radius="0.75rem",
-            border_bottom_right_radius=rx.cond(message.role == "user", "0.2rem", "0.75rem"),
-            border_bottom_left_radius=rx.cond(message.role == "user", "0.75rem", "0.2rem"),
             max_width="90%",
             font_size="0.85rem",
-            box_shadow="0 1px 4px rgba(0,0,0,0.06)",
+            box_shadow=_BUBBLE_SHADOW,
+            class_name="bubble-body",
+            style=_BUBBLE_TAIL_STYLE,
         ),
         display="flex",
-        justify_content=rx.cond(message.role == "user", "flex-end", "flex-start"),
         width="100%",
+        # Role colors, alignment and the tail corner come from the
+        # .bubble-user / .bubble-assistant rules in the app stylesheet
+        class_name=f"message-bubble bubble-{message.role}",
         padding_y="0.15rem",
     )
 
 
 def loading_indicator() -> rx.Component:
-    """Show loading dots when waiting for response"""
-    return rx.cond(
-        RecipeState.is_loading & ~RecipeState.is_streaming,
+    """Loading dots shown while waiting for the response"""
+    return rx.box(
         rx.box(
-            rx.box(
-                rx.hstack(
-                    rx.box(
-                        width="8px",
-                        height="8px",
-                        border_radius="50%",
-                        background="#888",
-                        class_name="loading-dot dot-1",
-                    ),
-                    rx.box(
-                        width="8px",
-                        height="8px",
-                        border_radius="50%",
-                        background="#888",
-                        class_name="loading-dot dot-2",
-                    ),
-                    rx.box(
-                        width="8px",
-                        height="8px",
-                        border_radius="50%",
-                        background="#888",
-                        class_name="loading-dot dot-3",
-                    ),
-                    spacing="1",
-                ),
-                background="#f5f5f5",
-                padding="0.8rem 1rem",
-                border_radius="0.75rem",
-                border_bottom_left_radius="0.2rem",
-                box_shadow="0 1px 4px rgba(0,0,0,0.06)",
-            ),
-            display="flex",
-            justify_content="flex-start",
-            width="100%",
-            padding_y="0.15rem",
+            rx.box(class_name="loading-dots"),
+            background="#f5f5f5",
+            padding="0.8rem 1rem",
+            border_radius="0.75rem",
+            border_bottom_left_radius="0.2rem",
+            box_shadow=_BUBBLE_SHADOW,
         ),
-        rx.fragment(),
+        display="flex",
+        justify_content="flex-start",
+        width="100%",
+        padding_y="0.15rem",
     )
 
 
-def streaming_indicator() -> rx.Component:
-    """Show streaming content while the agent is responding"""
-    return rx.cond(
-        RecipeState.is_streaming,
+def streaming_bubble(content: rx.Component) -> rx.Component:
+    """Assistant-style bubble holding the response being streamed"""
+    return rx.box(
         rx.box(
-            rx.box(
-                rx.cond(
-                    RecipeState.current_streaming_content != "",
-                    rx.markdown(
-                        RecipeState.current_streaming_content,
-                        font_size="0.85rem",
-                    ),
-                    rx.hstack(
-                        rx.spinner(size="1"),
-                        rx.text("Pensando...", color="gray", font_size="0.8rem"),
-                        spacing="2",
-                    ),
-                ),
-                background="#f5f5f5",
-                padding="0.6rem 0.9rem",
-                border_radius="0.75rem",
-                border_bottom_left_radius="0.2rem",
-                max_width="90%",
-                box_shadow="0 1px 4px rgba(0,0,0,0.06)",
-            ),
-            display="flex",
-            justify_content="flex-start",
-            width="100%",
-            padding_y="0.15rem",
+            content,
+            background="#f5f5f5",
+            padding="0.6rem 0.9rem",
+            border_radius="0.75rem",
+            border_bottom_left_radius="0.2rem",
+            max_width="90%",
+            box_shadow=_BUBBLE_SHADOW,
         ),
+        display="flex",
+        justify_content="flex-start",
+        width="100%",
+        padding_y="0.15rem",
+    )
+
+
+def streaming_content() -> rx.Component:
+    """The streamed response so far"""
+    return rx.box(
+        rx.foreach(RecipeState.streaming_blocks, lambda block: markdown_block(source=block)),
+        # The growing tail is plain text; it is parsed once it completes a block
+        rx.text(RecipeState.streaming_tail, white_space="pre-wrap"),
+        font_size="0.85rem",
+    )
+
+
+def thinking_indicator() -> rx.Component:
+    """Spinner shown while streaming has started but no text has arrived"""
+    return rx.hstack(
+        rx.spinner(size="1"),
+        rx.text("Pensando...", color="gray", font_size="0.8rem"),
+        spacing="2",
+    )
+
+
+def activity_indicator() -> rx.Component:
+    """Show the streaming response or loading dots, switching once on chat_status"""
+    return rx.match(
+        RecipeState.chat_status,
+        ("streaming_content", streaming_bubble(streaming_content())),
+        ("streaming_waiting", streaming_bubble(thinking_indicator())),
+        ("loading", loading_indicator()),
         rx.fragment(),
     )
 
@@ -135,7 +140,7 @@ def chat_input() -> rx.Component:
             disabled=RecipeState.is_loading,
             size="2",
             radius="full",
-            background="linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
+            background=_BRAND_GRADIENT,
             cursor="pointer",
         ),
         spacing="2",
@@ -145,41 +150,43 @@ def chat_input() -> rx.Component:
     )
 
 
+@rx.memo
+def chat_panel_header() -> rx.Component:
+    """Panel title and close button (static: memoized without props, renders once)"""
+    return rx.hstack(
+        rx.text(
+            "Asistente de Recetas IA",
+            font_weight="600",
+            font_size="0.95rem",
+        ),
+        rx.spacer(),
+        rx.icon_button(
+            rx.icon("x", size=16),
+            on_click=RecipeState.toggle_chat,
+            variant="ghost",
+            size="1",
+            cursor="pointer",
+        ),
+        width="100%",
+        padding="0.75rem 1rem",
+        border_bottom="1px solid #eee",
+        align="center",
+    )
+
+
 def chat_panel() -> rx.Component:
     """The chat panel content"""
     return rx.box(
         rx.vstack(
             # Header
-            rx.hstack(
-                rx.text(
-                    "Asistente de Recetas IA",
-                    font_weight="600",
-                    font_size="0.95rem",
-                ),
-                rx.spacer(),
-                rx.icon_button(
-                    rx.icon("x", size=16),
-                    on_click=RecipeState.toggle_chat,
-                    variant="ghost",
-                    size="1",
-                    cursor="pointer",
-                ),
-                width="100%",
-                padding="0.75rem 1rem",
-                border_bottom="1px solid #eee",
-                align="center",
-            ),
+            chat_panel_header(),
             
             # Dynamic welcome message
             rx.box(
-                rx.hstack(
-                    rx.text(RecipeState.welcome_emoji, font_size="0.85rem"),
-                    rx.text(
-                        RecipeState.welcome_message,
-                        font_size="0.85rem",
-                        color="#666",
-                    ),
-                    spacing="1",
+                rx.text(
+                    RecipeState.welcome_line,
+                    font_size="0.85rem",
+                    color="#666",
                 ),
                 padding="0.75rem 1rem",
                 background="#f9f9f9",
@@ -190,9 +197,8 @@ def chat_panel() -> rx.Component:
             # Messages area
             rx.box(
                 rx.vstack(
-                    rx.foreach(RecipeState.messages, message_bubble),
-                    loading_indicator(),
-                    streaming_indicator(),
+                    rx.foreach(RecipeState.messages, lambda message: floating_message_bubble(message=message, key=message.id)),
+                    activity_indicator(),
                     spacing="1",
                     align="start",
                     width="100%",
@@ -223,6 +229,7 @@ def chat_panel() -> rx.Component:
         bottom="90px",
         right="24px",
         z_index="1000",
+        display=rx.cond(RecipeState.chat_open, "block", "none"),
     )
 
 
@@ -233,15 +240,12 @@ def floating_chat_button() -> rx.Component:
             rx.icon("message-circle", size=24),
             size="4",
             radius="full",
-            background="linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
+            background=_BRAND_GRADIENT,
             box_shadow="0 4px 20px rgba(102, 126, 234, 0.4)",
             cursor="pointer",
             on_click=RecipeState.toggle_chat,
-            _hover={
-                "transform": "scale(1.05)",
-                "box_shadow": "0 6px 25px rgba(102, 126, 234, 0.5)",
-            },
-            style={"transition": "all 0.2s ease"},
+            _hover=_BUTTON_HOVER,
+            style=_TRANSITION_STYLE,
         ),
         position="fixed",
         bottom="24px",
@@ -257,9 +261,10 @@ def floating_chat() -> rx.Component:
     Shows a floating button that opens a chat panel when clicked.
     """
     return rx.fragment(
-        # Chat panel (shown when open)
+        # Chat panel: mounted on first open, then hidden rather than unmounted
+        # when closed so reopening doesn't re-render the whole message history
         rx.cond(
-            RecipeState.chat_open,
+            RecipeState.chat_panel_mounted,
             chat_panel(),
             rx.fragment(),
         ),
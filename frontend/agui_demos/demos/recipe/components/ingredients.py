@@ -34,19 +34,21 @@ def ingredient_badge(ingredient: Ingredient) -> rx.Component:
     )
 
 
-def ingredients_list() -> rx.Component:
+@rx.memo
+def ingredients_list(ingredients: list[Ingredient]) -> rx.Component:
     """
     A compact horizontal list of ingredient badges.
     
-    Great for showing ingredients at a glance.
+    Great for showing ingredients at a glance. Memoized on the ingredients
+    prop (use as `ingredients_list(ingredients=RecipeState.recipe.ingredients)`).
     """
     return rx.cond(
-        RecipeState.ingredient_count > 0,
+        ingredients.length() > 0,
         rx.box(
             rx.hstack(
                 rx.icon("shopping-basket", size=16, color="#667eea"),
                 rx.text(
-                    f"{RecipeState.ingredient_count} ingredientes",
+                    f"{ingredients.length()} ingredientes",
                     font_size="0.85rem",
                     font_weight="bold",
                     color="#667eea",
@@ -56,7 +58,7 @@ def ingredients_list() -> rx.Component:
             ),
             rx.flex(
                 rx.foreach(
-                    RecipeState.recipe.ingredients,
+                    ingredients,
                     ingredient_badge,
                 ),
                 flex_wrap="wrap",
@@ -72,14 +74,15 @@ def ingredients_list() -> rx.Component:
     )
 
 
-def ingredient_checklist() -> rx.Component:
+@rx.memo
+def ingredient_checklist(ingredients: list[Ingredient]) -> rx.Component:
     """
     A checklist-style ingredient display.
     
-    Useful for shopping or prep tracking.
+    Useful for shopping or prep tracking. Memoized on the ingredients prop.
     """
     return rx.cond(
-        RecipeState.ingredient_count > 0,
+        ingredients.length() > 0,
         rx.card(
             rx.vstack(
                 rx.hstack(
@@ -91,7 +94,7 @@ def ingredient_checklist() -> rx.Component:
                 rx.divider(margin_y="0.5rem"),
                 rx.vstack(
                     rx.foreach(
-                        RecipeState.recipe.ingredients,
+                        ingredients,
                         lambda ing: rx.hstack(
                             rx.checkbox(
                                 size="2",
@@ -6,7 +6,11 @@ A beautiful card displaying the generated recipe with all details.
 
 import reflex as rx
 
-from ..state import RecipeState
+from ..state import Ingredient, Recipe
+
+# Static style values shared by the components below
+_BRAND_GRADIENT = "linear-gradient(135deg, #667eea 0%, #764ba2 100%)"
+_GRADIENT_TEXT_STYLE = {"-webkit-background-clip": "text", "-webkit-text-fill-color": "transparent"}
 
 
 def time_badge(label: str, time: str) -> rx.Component:
@@ -40,12 +44,29 @@ def preference_badge(preference: str) -> rx.Component:
     )
 
 
-def instruction_item(instruction: str, index: int) -> rx.Component:
-    """A single instruction step"""
+@rx.memo
+def ingredient_row(ingredient: Ingredient) -> rx.Component:
+    """A single ingredient line (memoized: re-renders only when its ingredient changes)"""
+    return rx.hstack(
+        rx.text(ingredient.icon, font_size="1.2rem"),
+        rx.text(
+            ingredient.amount,
+            font_weight="bold",
+            display="inline",
+        ),
+        rx.text(ingredient.name, display="inline"),
+        spacing="2",
+        padding_y="0.3rem",
+    )
+
+
+@rx.memo
+def instruction_row(instruction: str, index: int) -> rx.Component:
+    """A single instruction step (memoized: re-renders only when its text or position changes)"""
     return rx.hstack(
         rx.box(
-            rx.text(f"{index + 1}", font_weight="bold", color="white", font_size="0.8rem"),
-            background="linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
+            rx.text(index + 1, font_weight="bold", color="white", font_size="0.8rem"),
+            background=_BRAND_GRADIENT,
             border_radius="50%",
             width="28px",
             height="28px",
@@ -61,7 +82,36 @@ def instruction_item(instruction: str, index: int) -> rx.Component:
     )
 
 
-def recipe_card() -> rx.Component:
+@rx.memo
+def recipe_empty_state() -> rx.Component:
+    """Placeholder shown before a recipe exists (static: memoized without props, renders once)"""
+    return rx.center(
+        rx.vstack(
+            rx.icon("book-open", size=64, color="#e0e0e0"),
+            rx.text(
+                "Pide una receta para comenzar",
+                color="gray",
+                font_size="1.1rem",
+            ),
+            rx.text(
+                'Prueba: "Haz una receta de paella valenciana"',
+                color="#a0a0a0",
+                font_size="0.9rem",
+                font_style="italic",
+            ),
+            spacing="3",
+            align="center",
+        ),
+        padding="3rem",
+        border="2px dashed #e0e0e0",
+        border_radius="1rem",
+        width="100%",
+        min_height="300px",
+    )
+
+
+@rx.memo
+def recipe_card(recipe: Recipe, has_preferences: bool) -> rx.Component:
     """
     Main recipe card component.
     
@@ -70,27 +120,31 @@ def recipe_card() -> rx.Component:
     - Time and servings badges
     - Ingredients list
     - Step-by-step instructions
+    
+    Memoized on its props (use as `recipe_card(recipe=RecipeState.recipe,
+    has_preferences=RecipeState.has_preferences)`) so unrelated state updates
+    such as streaming chat tokens don't re-render it.
     """
     return rx.cond(
-        RecipeState.has_recipe,
+        recipe.title != "",
         rx.card(
             rx.vstack(
                 # Header with title
                 rx.box(
                     rx.heading(
-                        RecipeState.recipe.title,
+                        recipe.title,
                         size="6",
-                        background="linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
+                        background=_BRAND_GRADIENT,
                         background_clip="text",
-                        style={"-webkit-background-clip": "text", "-webkit-text-fill-color": "transparent"},
+                        style=_GRADIENT_TEXT_STYLE,
                     ),
                     width="100%",
                 ),
                 
                 # Time, skill level and preferences badges
                 rx.hstack(
-                    time_badge("Tiempo:", RecipeState.recipe.cooking_time),
-                    skill_badge(RecipeState.recipe.skill_level),
+                    time_badge("Tiempo:", recipe.cooking_time),
+                    skill_badge(recipe.skill_level),
                     spacing="4",
                     flex_wrap="wrap",
                     margin_y="0.5rem",
@@ -98,10 +152,10 @@ def recipe_card() -> rx.Component:
                 
                 # Special preferences
                 rx.cond(
-                    RecipeState.recipe.special_preferences.length() > 0,
+                    has_preferences,
                     rx.flex(
                         rx.foreach(
-                            RecipeState.recipe.special_preferences,
+                            recipe.special_preferences,
                             preference_badge,
                         ),
                         gap="0.5rem",
@@ -123,18 +177,8 @@ def recipe_card() -> rx.Component:
                     ),
                     rx.box(
                         rx.foreach(
-                            RecipeState.recipe.ingredients,
-                            lambda ing: rx.hstack(
-                                rx.text(ing.icon, font_size="1.2rem"),
-                                rx.text(
-                                    ing.amount,
-                                    font_weight="bold",
-                                    display="inline",
-                                ),
-                                rx.text(ing.name, display="inline"),
-                                spacing="2",
-                                padding_y="0.3rem",
-                            ),
+                            recipe.ingredients,
+                            lambda ing: ingredient_row(ingredient=ing, key=ing.id),
                         ),
                         margin_top="0.75rem",
                     ),
@@ -153,8 +197,8 @@ def recipe_card() -> rx.Component:
                     ),
                     rx.vstack(
                         rx.foreach(
-                            RecipeState.recipe.instructions,
-                            lambda inst, idx: instruction_item(inst, idx),
+                            recipe.instructions,
+                            lambda inst, idx: instruction_row(instruction=inst, index=idx),
                         ),
                         spacing="3",
                         margin_top="0.75rem",
@@ -175,27 +219,5 @@ def recipe_card() -> rx.Component:
             width="100%",
         ),
         # Empty state when no recipe
-        rx.center(
-            rx.vstack(
-                rx.icon("book-open", size=64, color="#e0e0e0"),
-                rx.text(
-                    "Pide una receta para comenzar",
-                    color="gray",
-                    font_size="1.1rem",
-                ),
-                rx.text(
-                    'Prueba: "Haz una receta de paella valenciana"',
-                    color="#a0a0a0",
-                    font_size="0.9rem",
-                    font_style="italic",
-                ),
-                spacing="3",
-                align="center",
-            ),
-            padding="3rem",
-            border="2px dashed #e0e0e0",
-            border_radius="1rem",
-            width="100%",
-            min_height="300px",
-        ),
+        recipe_empty_state(),
     )
@@ -24,13 +24,14 @@ DIETARY_PREFERENCES = [
 ]
 
 
-def time_selector() -> rx.Component:
+@rx.memo
+def time_selector(cooking_time: str) -> rx.Component:
     """Dropdown for cooking time selection"""
     return rx.hstack(
         rx.icon("clock", size=16, color="#666"),
         rx.select(
             COOKING_TIMES,
-            value=RecipeState.recipe.cooking_time,
+            value=cooking_time,
             on_change=RecipeState.set_cooking_time,
             size="2",
         ),
@@ -39,13 +40,14 @@ def time_selector() -> rx.Component:
     )
 
 
-def skill_selector() -> rx.Component:
+@rx.memo
+def skill_selector(skill_level: str) -> rx.Component:
     """Dropdown for skill level selection"""
     return rx.hstack(
         rx.icon("chef-hat", size=16, color="#666"),
         rx.select(
             SKILL_LEVELS,
-            value=RecipeState.recipe.skill_level,
+            value=skill_level,
             on_change=RecipeState.set_skill_level,
             size="2",
         ),
@@ -54,7 +56,19 @@ def skill_selector() -> rx.Component:
     )
 
 
-def dietary_preferences() -> rx.Component:
+@rx.memo
+def pref_checkbox(label: str, checked: bool) -> rx.Component:
+    """Checkbox toggling a single dietary preference"""
+    return rx.checkbox(
+        label,
+        checked=checked,
+        on_change=RecipeState.toggle_preference(label),
+        size="2",
+    )
+
+
+@rx.memo
+def dietary_preferences(selected: list[str]) -> rx.Component:
     """Section for dietary preferences"""
     return rx.box(
         rx.text(
@@ -65,47 +79,11 @@ def dietary_preferences() -> rx.Component:
             margin_bottom="0.5rem",
         ),
         rx.hstack(
-            rx.checkbox(
-                "Alta Proteína",
-                checked=RecipeState.pref_alta_proteina,
-                on_change=RecipeState.toggle_preference("Alta Proteína"),
-                size="2",
-            ),
-            rx.checkbox(
-                "Bajo en Carbohidratos",
-                checked=RecipeState.pref_bajo_carbohidratos,
-                on_change=RecipeState.toggle_preference("Bajo en Carbohidratos"),
-                size="2",
-            ),
-            rx.checkbox(
-                "Picante",
-                checked=RecipeState.pref_picante,
-                on_change=RecipeState.toggle_preference("Picante"),
-                size="2",
-            ),
-            rx.checkbox(
-                "Económico",
-                checked=RecipeState.pref_economico,
-                on_change=RecipeState.toggle_preference("Económico"),
-                size="2",
-            ),
-            rx.checkbox(
-                "Un Solo Plato",
-                checked=RecipeState.pref_un_solo_plato,
-                on_change=RecipeState.toggle_preference("Un Solo Plato"),
-                size="2",
-            ),
-            rx.checkbox(
-                "Vegetariano",
-                checked=RecipeState.pref_vegetariano,
-                on_change=RecipeState.toggle_preference("Vegetariano"),
-                size="2",
-            ),
-            rx.checkbox(
-                "Vegano",
-                checked=RecipeState.pref_vegano,
-                on_change=RecipeState.toggle_preference("Vegano"),
-                size="2",
+            rx.foreach(
+                DIETARY_PREFERENCES,
+                lambda preference: pref_checkbox(
+                    label=preference, checked=selected.contains(preference)
+                ),
             ),
             spacing="4",
             flex_wrap="wrap",
@@ -114,8 +92,15 @@ def dietary_preferences() -> rx.Component:
     )
 
 
+@rx.memo
 def ingredient_card(ingredient: Ingredient, index: int) -> rx.Component:
-    """A single ingredient card - editable with delete button"""
+    """
+    A single ingredient card - editable with delete button.
+    
+    Memoized with partially applied event handlers (the index is bound, the
+    input value is appended on change), so editing one card doesn't
+    re-render the others.
+    """
     return rx.box(
         # Delete button in top-right corner
         rx.icon_button(
@@ -127,7 +112,7 @@ def ingredient_card(ingredient: Ingredient, index: int) -> rx.Component:
             top="4px",
             right="4px",
             cursor="pointer",
-            on_click=lambda: RecipeState.remove_ingredient(index),
+            on_click=RecipeState.remove_ingredient(index),
             _hover={"background": "#fee2e2", "color": "#dc2626"},
         ),
         rx.hstack(
@@ -135,7 +120,7 @@ def ingredient_card(ingredient: Ingredient, index: int) -> rx.Component:
             rx.vstack(
                 rx.input(
                     value=ingredient.name,
-                    on_change=lambda v: RecipeState.update_ingredient_name(index, v),
+                    on_change=RecipeState.update_ingredient_name(index),
                     placeholder="Nombre del ingrediente",
                     variant="soft",
                     size="1",
@@ -144,7 +129,7 @@ def ingredient_card(ingredient: Ingredient, index: int) -> rx.Component:
                 ),
                 rx.input(
                     value=ingredient.amount,
-                    on_change=lambda v: RecipeState.update_ingredient_amount(index, v),
+                    on_change=RecipeState.update_ingredient_amount(index),
                     placeholder="Cantidad",
                     variant="soft",
                     size="1",
@@ -199,7 +184,9 @@ def ingredients_section() -> rx.Component:
         rx.flex(
             rx.foreach(
                 RecipeState.recipe.ingredients,
-                lambda ing, idx: ingredient_card(ing, idx),
+                # Keyed by ingredient id: removing or inserting a row doesn't
+                # re-render the cards after it
+                lambda ing, idx: ingredient_card(ingredient=ing, index=idx, key=ing.id),
             ),
             gap="0.75rem",
             flex_wrap="wrap",
@@ -208,8 +195,9 @@ def ingredients_section() -> rx.Component:
     )
 
 
+@rx.memo
 def instruction_step(instruction: str, index: int) -> rx.Component:
-    """A single instruction step - editable"""
+    """A single instruction step - editable (memoized like ingredient_card)"""
     return rx.hstack(
         rx.box(
             rx.text(
@@ -229,7 +217,7 @@ def instruction_step(instruction: str, index: int) -> rx.Component:
         ),
         rx.text_area(
             value=instruction,
-            on_change=lambda val: RecipeState.update_instruction(index, val),
+            on_change=RecipeState.update_instruction(index),
             width="100%",
             min_height="60px",
             resize="vertical",
@@ -268,7 +256,7 @@ def instructions_section() -> rx.Component:
         rx.vstack(
             rx.foreach(
                 RecipeState.recipe.instructions,
-                lambda inst, idx: instruction_step(inst, idx),
+                lambda inst, idx: instruction_step(instruction=inst, index=idx),
             ),
             spacing="3",
             width="100%",
@@ -277,12 +265,13 @@ def instructions_section() -> rx.Component:
     )
 
 
-def improve_button() -> rx.Component:
+@rx.memo
+def improve_button(is_loading: bool) -> rx.Component:
     """Button to improve recipe with AI"""
     return rx.center(
         rx.button(
             rx.cond(
-                RecipeState.is_loading,
+                is_loading,
                 rx.hstack(
                     rx.spinner(size="1", color="white"),
                     rx.text("Mejorando..."),
@@ -298,7 +287,7 @@ def improve_button() -> rx.Component:
             background="linear-gradient(135deg, #f97316 0%, #ea580c 100%)",
             color="white",
             cursor="pointer",
-            disabled=RecipeState.is_loading,
+            disabled=is_loading,
             on_click=RecipeState.improve_with_ai,
             _hover={"opacity": "0.9"},
             padding_x="2rem",
@@ -330,8 +319,8 @@ def recipe_form() -> rx.Component:
             
             # Time and skill selectors
             rx.hstack(
-                time_selector(),
-                skill_selector(),
+                time_selector(cooking_time=RecipeState.recipe.cooking_time),
+                skill_selector(skill_level=RecipeState.recipe.skill_level),
                 spacing="4",
                 margin_y="0.75rem",
             ),
@@ -339,7 +328,7 @@ def recipe_form() -> rx.Component:
             rx.divider(margin_y="0.5rem"),
             
             # Dietary preferences
-            dietary_preferences(),
+            dietary_preferences(selected=RecipeState.recipe.special_preferences),
             
             rx.divider(margin_y="0.75rem"),
             
@@ -352,7 +341,7 @@ def recipe_form() -> rx.Component:
             instructions_section(),
             
             # Improve button
-            improve_button(),
+            improve_button(is_loading=RecipeState.is_loading),
             
             spacing="3",
             align="start",
@@ -6,18 +6,32 @@ to update the UI in real-time.
 """
 
 import os
+import re
+import time
+import uuid
 import asyncio
+import logging
+from functools import lru_cache
 from typing import Any, Optional
 
 import reflex as rx
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
 from dotenv import load_dotenv
 
-from ...shared.ag_ui_client import AGUIClient, AGUIClientConfig, AGUIEventType
+from ...shared.ag_ui_client import (
+    AGUIClient,
+    AGUIClientConfig,
+    AGUIEventType,
+    get_shared_http_client,
+)
+from ...shared.chat import STREAM_FLUSH_INTERVAL, append_capped
+from ...shared.markdown import split_markdown_blocks
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 # Helper function to map skill level from English to Spanish
 def _map_skill_level(skill: str) -> str:
@@ -35,6 +49,8 @@ def _map_skill_level(skill: str) -> str:
 
 class Ingredient(BaseModel):
     """Ingredient model for recipes (Agent Framework schema)"""
+    # Client-side identity used as the render key; not sent to the agent
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     icon: str = "🍽️"
     name: str = ""
     amount: str = ""
@@ -50,10 +66,69 @@ class Recipe(BaseModel):
     instructions: list[str] = []
 
 
+def _recipe_from_data(recipe_data: dict[str, Any]) -> Recipe:
+    """Build a Recipe from agent state data in a single pydantic validation pass"""
+    return Recipe.model_validate({
+        **recipe_data,
+        "skill_level": _map_skill_level(recipe_data.get("skill_level", "Intermediate")),
+    })
+
+
+def _recipe_payload(recipe: Recipe) -> dict[str, Any]:
+    """The recipe as agent state: the agent's schema has no ingredient ids"""
+    return recipe.model_dump(exclude={"ingredients": {"__all__": {"id"}}})
+
+
+def _apply_json_patch(doc: dict[str, Any], ops: list[dict[str, Any]]) -> None:
+    """Apply RFC 6902 add/replace/remove operations to doc in place"""
+    for op in ops:
+        parts = [
+            part.replace("~1", "/").replace("~0", "~")
+            for part in op["path"].split("/")[1:]
+        ]
+        parent: Any = doc
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        key = parts[-1]
+        kind = op["op"]
+        if isinstance(parent, list):
+            if kind == "add":
+                parent.insert(len(parent) if key == "-" else int(key), op["value"])
+            elif kind == "replace":
+                parent[int(key)] = op["value"]
+            elif kind == "remove":
+                del parent[int(key)]
+            else:
+                raise ValueError(f"Unsupported patch op: {kind}")
+        elif kind in ("add", "replace"):
+            parent[key] = op["value"]
+        elif kind == "remove":
+            del parent[key]
+        else:
+            raise ValueError(f"Unsupported patch op: {kind}")
+
+
+# Characters/line starts that make a message worth a markdown parse
+_MARKDOWN_SYNTAX = re.compile(
+    r"[*_`#>|~\[\]<&]|https?://|^\s*(?:[-+]|\d+[.)])\s|^\s*(?:-{3,}|={3,})\s*$",
+    re.MULTILINE,
+)
+
+
+@lru_cache(maxsize=512)
+def _has_markdown(content: str) -> bool:
+    """Whether content contains markdown syntax (cached: repeated snippets are checked once)"""
+    return _MARKDOWN_SYNTAX.search(content) is not None
+
+
 class ChatMessage(BaseModel):
     """Chat message model"""
+    # Stable identity used as the render key, so trimming old messages doesn't re-key the list
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     role: str = "user"
     content: str = ""
+    # Plain-text messages are rendered as text, skipping the client-side markdown parse
+    has_markdown: bool = False
 
 
 class RecipeState(rx.State):
@@ -73,14 +148,18 @@ class RecipeState(rx.State):
     
     # Recipe state (from AG-UI STATE_SNAPSHOT/STATE_DELTA)
     recipe: Recipe = Recipe()
-    _last_recipe_hash: str = ""  # Track content hash to detect recipe changes
     
     # UI state
     is_loading: bool = False
     is_streaming: bool = False
-    current_streaming_content: str = ""
+    # Streaming message: finished markdown blocks plus the growing tail, so
+    # each update only sends the tail (the full text stays backend-only)
+    streaming_blocks: list[str] = []
+    streaming_tail: str = ""
+    _streaming_content: str = ""
     error_message: str = ""
     chat_open: bool = False  # For floating chat
+    chat_panel_mounted: bool = False  # Set on first open; the panel is then only hidden when closed
     
     # Agent configuration
     thread_id: str = "default"
@@ -95,45 +174,35 @@ class RecipeState(rx.State):
         """Check if there's an error to display"""
         return bool(self.error_message)
     
+    @rx.var
+    def chat_status(self) -> str:
+        """
+        Agent activity shown below the messages, as a single value to switch on:
+        "streaming_content", "streaming_waiting", "loading" or "idle"
+        """
+        if self.is_streaming:
+            if self.streaming_blocks or self.streaming_tail:
+                return "streaming_content"
+            return "streaming_waiting"
+        if self.is_loading:
+            return "loading"
+        return "idle"
+    
     @rx.var
     def message_count(self) -> int:
         """Number of messages in chat"""
         return len(self.messages)
     
+    @rx.var
+    def has_preferences(self) -> bool:
+        """Check if the recipe has any dietary preferences"""
+        return bool(self.recipe.special_preferences)
+    
     @rx.var
     def ingredient_count(self) -> int:
         """Number of ingredients in current recipe"""
         return len(self.recipe.ingredients)
     
-    # Computed vars for each dietary preference to avoid React hooks issues
-    @rx.var
-    def pref_alta_proteina(self) -> bool:
-        return "Alta Proteína" in self.recipe.special_preferences
-    
-    @rx.var
-    def pref_bajo_carbohidratos(self) -> bool:
-        return "Bajo en Carbohidratos" in self.recipe.special_preferences
-    
-    @rx.var
-    def pref_picante(self) -> bool:
-        return "Picante" in self.recipe.special_preferences
-    
-    @rx.var
-    def pref_economico(self) -> bool:
-        return "Económico" in self.recipe.special_preferences
-    
-    @rx.var
-    def pref_un_solo_plato(self) -> bool:
-        return "Un Solo Plato" in self.recipe.special_preferences
-    
-    @rx.var
-    def pref_vegetariano(self) -> bool:
-        return "Vegetariano" in self.recipe.special_preferences
-    
-    @rx.var
-    def pref_vegano(self) -> bool:
-        return "Vegano" in self.recipe.special_preferences
-    
     def set_input(self, value: str):
         """Update the current input value"""
         self.current_input = value
@@ -158,7 +227,6 @@ class RecipeState(rx.State):
         self.recipe = Recipe()
         self.messages = []
         self.current_input = ""
-        self._last_recipe_hash = ""
     
     @rx.var
     def welcome_message(self) -> str:
@@ -182,9 +250,15 @@ class RecipeState(rx.State):
             return "👨‍🍳"
         return "👋"
     
+    @rx.var
+    def welcome_line(self) -> str:
+        """Welcome emoji and message as a single line of text"""
+        return f"{self.welcome_emoji} {self.welcome_message}"
+    
     def toggle_chat(self):
         """Toggle the floating chat panel open/closed"""
         self.chat_open = not self.chat_open
+        self.chat_panel_mounted = True
     
     def set_cooking_time(self, value: str):
         """Update cooking time"""
@@ -292,11 +366,7 @@ class RecipeState(rx.State):
         new_ingredients = list(self.recipe.ingredients)
         if 0 <= index < len(new_ingredients):
             old_ing = new_ingredients[index]
-            new_ingredients[index] = Ingredient(
-                icon=old_ing.icon,
-                name=value,
-                amount=old_ing.amount,
-            )
+            new_ingredients[index] = old_ing.model_copy(update={"name": value})
             
             self.recipe = Recipe(
                 title=self.recipe.title,
@@ -312,11 +382,7 @@ class RecipeState(rx.State):
         new_ingredients = list(self.recipe.ingredients)
         if 0 <= index < len(new_ingredients):
             old_ing = new_ingredients[index]
-            new_ingredients[index] = Ingredient(
-                icon=old_ing.icon,
-                name=old_ing.name,
-                amount=value,
-            )
+            new_ingredients[index] = old_ing.model_copy(update={"amount": value})
             
             self.recipe = Recipe(
                 title=self.recipe.title,
@@ -338,7 +404,69 @@ class RecipeState(rx.State):
         self.recipe = Recipe()
         self.current_input = ""
         self.error_message = ""
-        self.current_streaming_content = ""
+        self._reset_streaming()
+    
+    def _reset_streaming(self):
+        """Clear the streaming message"""
+        self._streaming_content = ""
+        self.streaming_blocks = []
+        self.streaming_tail = ""
+    
+    def _append_streaming_content(self, content: str):
+        """
+        Append a token to the streaming message.
+        
+        Only the tail is re-split; blocks it completes move to streaming_blocks,
+        so the block list (and its markdown render) changes on block boundaries only.
+        """
+        self._streaming_content += content
+        *done, self.streaming_tail = split_markdown_blocks(self.streaming_tail + content)
+        if done:
+            self.streaming_blocks = self.streaming_blocks + done
+    
+    def _add_message(self, role: str, content: str):
+        """Append a chat message, dropping the oldest ones beyond MAX_CHAT_MESSAGES"""
+        message = ChatMessage(role=role, content=content, has_markdown=_has_markdown(content))
+        append_capped(self.messages, message)
+    
+    def _apply_recipe_data(self, recipe_data: dict[str, Any]):
+        """Replace the recipe with agent state data, keeping the current one if it is malformed"""
+        try:
+            recipe = _recipe_from_data(recipe_data)
+        except ValidationError as e:
+            logger.warning("🍳 Ignoring malformed recipe state from agent: %s", e)
+            return
+        # Agent snapshots carry no ingredient ids; reuse the current ones by
+        # position so rows that are still there keep their render keys.
+        # Patched documents keep their ids (new rows get fresh ones).
+        raw_ingredients = recipe_data.get("ingredients") or ()
+        if not any(isinstance(raw, dict) and "id" in raw for raw in raw_ingredients):
+            for current, ingredient in zip(self.recipe.ingredients, recipe.ingredients):
+                ingredient.id = current.id
+        self.recipe = recipe
+    
+    def _apply_recipe_patch(self, ops: list[dict[str, Any]]):
+        """
+        Apply JSON Patch operations targeting /recipe.
+        
+        Whole-recipe replacements are hydrated directly; per-field operations
+        (e.g. /recipe/ingredients/2/amount) are applied to the current recipe
+        so only the touched fields change.
+        """
+        if all(op.get("path") == "/recipe" for op in ops):
+            recipe_data = ops[-1].get("value")
+            if isinstance(recipe_data, dict) and recipe_data:
+                self._apply_recipe_data(recipe_data)
+            return
+        
+        doc = {"recipe": self.recipe.model_dump()}
+        try:
+            _apply_json_patch(doc, ops)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            logger.warning("🍳 Ignoring recipe patch that does not apply: %s", e)
+            return
+        if isinstance(doc.get("recipe"), dict):
+            self._apply_recipe_data(doc["recipe"])
     
     def _get_agent_url(self) -> str:
         """Get the agent backend URL from environment"""
@@ -377,38 +505,27 @@ class RecipeState(rx.State):
         self.current_input = ""
         
         # Add user message to chat
-        self.messages = self.messages + [
-            ChatMessage(role="user", content=user_message)
-        ]
+        self._add_message("user", user_message)
         
         # Clear any previous error
         self.error_message = ""
         self.is_loading = True
         self.is_streaming = False
-        self.current_streaming_content = ""
+        self._reset_streaming()
         
         yield  # Update UI immediately
         
         try:
             # Configure AG-UI client
             base_url, endpoint = self._parse_agent_url()
-            config = AGUIClientConfig(base_url=base_url, endpoint=endpoint)
+            config = AGUIClientConfig(
+                base_url=base_url, endpoint=endpoint, http_client=get_shared_http_client()
+            )
             client = AGUIClient(config)
             
             # Prepare the current recipe state to send
-            current_state = {
-                "recipe": {
-                    "title": self.recipe.title,
-                    "skill_level": self.recipe.skill_level,
-                    "special_preferences": self.recipe.special_preferences,
-                    "cooking_time": self.recipe.cooking_time,
-                    "ingredients": [
-                        {"icon": ing.icon, "name": ing.name, "amount": ing.amount}
-                        for ing in self.recipe.ingredients
-                    ],
-                    "instructions": list(self.recipe.instructions),
-                }
-            }
+            current_state = {"recipe": _recipe_payload(self.recipe)}
+            last_flush = 0.0
             
             # Process events from the agent
             async for event in client.run(
@@ -416,8 +533,8 @@ class RecipeState(rx.State):
                 thread_id=self.thread_id,
                 state=current_state
             ):
-                # Debug logging
-                print(f"🍳 Recipe Event: {event.type} - Data keys: {list(event.data.keys()) if event.data else 'None'}")
+                # Debug logging (lazy: arguments are only formatted when DEBUG is enabled)
+                logger.debug("🍳 Recipe Event: %s - Data keys: %s", event.type, event.data.keys())
                 
                 # Handle different event types
                 if event.type == AGUIEventType.RUN_STARTED:
@@ -426,32 +543,31 @@ class RecipeState(rx.State):
                 
                 elif event.type == AGUIEventType.TEXT_MESSAGE_START:
                     self.is_streaming = True
-                    self.current_streaming_content = ""
-                    print(f"🍳 TEXT_MESSAGE_START received")
+                    self._reset_streaming()
+                    logger.debug("🍳 TEXT_MESSAGE_START received")
                     yield
                 
                 elif event.type == AGUIEventType.TEXT_MESSAGE_CONTENT:
                     # Handle both 'delta' and 'content' keys (different AG-UI implementations)
                     content = event.data.get("delta", event.data.get("content", ""))
-                    self.current_streaming_content += content
-                    print(f"🍳 TEXT_MESSAGE_CONTENT: '{content[:50]}...' (total: {len(self.current_streaming_content)})")
-                    yield
+                    self._append_streaming_content(content)
+                    # Throttle token updates; any other event (or the end of the
+                    # message) yields and flushes what is pending
+                    now = time.monotonic()
+                    if now - last_flush >= STREAM_FLUSH_INTERVAL:
+                        last_flush = now
+                        yield
                 
                 elif event.type == AGUIEventType.TEXT_MESSAGE_END:
                     # Add completed message to chat
-                    print(f"🍳 TEXT_MESSAGE_END - streaming content: '{self.current_streaming_content[:100] if self.current_streaming_content else 'EMPTY'}...'")
-                    if self.current_streaming_content:
-                        self.messages = self.messages + [
-                            ChatMessage(
-                                role="assistant",
-                                content=self.current_streaming_content
-                            )
-                        ]
-                        print(f"🍳 Added message to chat. Total messages: {len(self.messages)}")
+                    logger.debug("🍳 TEXT_MESSAGE_END - streaming content length: %d", len(self._streaming_content))
+                    if self._streaming_content:
+                        self._add_message("assistant", self._streaming_content)
+                        logger.debug("🍳 Added message to chat. Total messages: %d", len(self.messages))
                     else:
-                        print(f"🍳 WARNING: No streaming content to add!")
+                        logger.warning("🍳 No streaming content to add!")
                     self.is_streaming = False
-                    self.current_streaming_content = ""
+                    self._reset_streaming()
                     yield
                 
                 elif event.type == AGUIEventType.STATE_SNAPSHOT:
@@ -460,57 +576,20 @@ class RecipeState(rx.State):
                     state_data = event.data.get("snapshot", event.data.get("state", {}))
                     recipe_data = state_data.get("recipe", {})
                     
-                    new_title = recipe_data.get("title", "")
-                    if new_title:
-                        # Create hash of recipe content to detect any changes
-                        import json
-                        content_hash = json.dumps(recipe_data, sort_keys=True)
-                        is_recipe_changed = content_hash != self._last_recipe_hash
-                        
-                        # Update recipe state
-                        self.recipe = Recipe(
-                            title=new_title,
-                            skill_level=_map_skill_level(recipe_data.get("skill_level", "Intermediate")),
-                            special_preferences=recipe_data.get("special_preferences", []),
-                            cooking_time=recipe_data.get("cooking_time", "30 min"),
-                            ingredients=[
-                                Ingredient(
-                                    icon=ing.get("icon", "🍽️"),
-                                    name=ing.get("name", ""),
-                                    amount=ing.get("amount", "")
-                                )
-                                for ing in recipe_data.get("ingredients", [])
-                            ],
-                            instructions=recipe_data.get("instructions", []),
-                        )
-                        
-                        # Track recipe changes (but don't add automatic message - the agent sends its own)
-                        if is_recipe_changed:
-                            self._last_recipe_hash = content_hash
+                    if recipe_data.get("title"):
+                        # Update recipe state (the agent sends its own chat message,
+                        # so no change detection/automatic message is needed here)
+                        self._apply_recipe_data(recipe_data)
                     yield
                 
                 elif event.type == AGUIEventType.STATE_DELTA:
                     # Handle incremental state updates (update recipe but don't add message - STATE_SNAPSHOT handles that)
-                    delta = event.data.get("delta", [])
-                    for op in delta:
-                        if op.get("path") == "/recipe":
-                            recipe_data = op.get("value", {})
-                            if recipe_data:
-                                self.recipe = Recipe(
-                                    title=recipe_data.get("title", ""),
-                                    skill_level=_map_skill_level(recipe_data.get("skill_level", "Intermediate")),
-                                    special_preferences=recipe_data.get("special_preferences", []),
-                                    cooking_time=recipe_data.get("cooking_time", "30 min"),
-                                    ingredients=[
-                                        Ingredient(
-                                            icon=ing.get("icon", "🍽️"),
-                                            name=ing.get("name", ""),
-                                            amount=ing.get("amount", "")
-                                        )
-                                        for ing in recipe_data.get("ingredients", [])
-                                    ],
-                                    instructions=recipe_data.get("instructions", []),
-                                )
+                    recipe_ops = [
+                        op for op in event.data.get("delta", [])
+                        if op.get("path", "").startswith("/recipe")
+                    ]
+                    if recipe_ops:
+                        self._apply_recipe_patch(recipe_ops)
                     yield
                 
                 elif event.type == AGUIEventType.TOOL_CALL_START:
@@ -540,7 +619,7 @@ class RecipeState(rx.State):
         """Reset the agent state on the backend"""
         try:
             base_url, _ = self._parse_agent_url()
-            config = AGUIClientConfig(base_url=base_url)
+            config = AGUIClientConfig(base_url=base_url, http_client=get_shared_http_client())
             client = AGUIClient(config)
             
             await client.reset(self.thread_id)
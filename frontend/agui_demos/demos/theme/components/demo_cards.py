@@ -10,72 +10,45 @@ import reflex as rx
 from ..state import ThemeState
 
 
-def hero_section() -> rx.Component:
-    """Hero section with Ilitia branding and dynamic visuals"""
-    return rx.box(
+@rx.memo
+def hero_banner(
+    emoji: str, mood: str, description: str, background_image: str
+) -> rx.Component:
+    """Hero banner; re-renders only when one of its theme props changes"""
+    return rx.el.div(
         # Background image overlay (if set)
         rx.cond(
-            ThemeState.theme.background_image != "",
-            rx.box(
-                position="absolute",
-                top="0",
-                left="0",
-                right="0",
-                bottom="0",
-                background_image=f"url({ThemeState.theme.background_image})",
-                background_size="cover",
-                background_position="center",
-                opacity="0.3",
-                border_radius="1rem",
+            background_image != "",
+            rx.el.div(
+                class_name="ilitia-hero-image",
+                style={"background_image": f"url({background_image})"},
             ),
             rx.fragment(),
         ),
-        rx.vstack(
+        rx.el.div(
             # Dynamic hero emoji
-            rx.text(
-                ThemeState.theme.hero_emoji,
-                font_size="4rem",
-                class_name="hero-emoji",
-            ),
-            rx.hstack(
-                rx.text(
-                    "Ilitia",
-                    font_size="2.5rem",
-                    font_weight="bold",
-                    color="white",
-                ),
-                spacing="3",
-                align="center",
-            ),
-            rx.text(
-                ThemeState.theme.mood,
-                font_size="1.2rem",
-                color="rgba(255,255,255,0.9)",
-                font_weight="500",
-            ),
-            rx.text(
-                ThemeState.theme.description,
-                font_size="0.9rem",
-                color="rgba(255,255,255,0.7)",
-                text_align="center",
-                max_width="500px",
-            ),
-            spacing="3",
-            align="center",
-            padding="3rem",
-            position="relative",
-            z_index="1",
+            rx.el.div(emoji, class_name="ilitia-hero-emoji"),
+            rx.el.div("Ilitia", class_name="ilitia-hero-title"),
+            rx.el.p(mood, class_name="ilitia-hero-mood"),
+            rx.el.p(description, class_name="ilitia-hero-description"),
+            class_name="ilitia-hero-content",
         ),
-        background=ThemeState.gradient_style,
-        border_radius="1rem",
-        width="100%",
-        box_shadow="0 10px 40px rgba(0,0,0,0.15)",
-        position="relative",
-        overflow="hidden",
-        style={"transition": "all 0.5s ease"},
+        # Static rules in assets/ilitia.css
+        class_name="ilitia-hero",
     )
 
 
+def hero_section() -> rx.Component:
+    """Hero section with Ilitia branding and dynamic visuals"""
+    return hero_banner(
+        emoji=ThemeState.theme.hero_emoji,
+        mood=ThemeState.theme.mood,
+        description=ThemeState.theme.description,
+        background_image=ThemeState.theme.background_image,
+    )
+
+
+@rx.memo
 def service_card(emoji: str, title: str, description: str) -> rx.Component:
     """A service card component with dynamic emoji"""
     return rx.box(
@@ -84,13 +57,13 @@ def service_card(emoji: str, title: str, description: str) -> rx.Component:
                 rx.text(emoji, font_size="2rem"),
                 padding="1rem",
                 border_radius="0.75rem",
-                background=ThemeState.gradient_style,
+                background="var(--ilitia-gradient)",
             ),
             rx.text(
                 title,
                 font_size="1.1rem",
                 font_weight="600",
-                color=ThemeState.theme.text_color,
+                color="var(--ilitia-text)",
             ),
             rx.text(
                 description,
@@ -103,7 +76,7 @@ def service_card(emoji: str, title: str, description: str) -> rx.Component:
             align="center",
             padding="1.5rem",
         ),
-        background=ThemeState.theme.card_background,
+        background="var(--ilitia-card)",
         border_radius="1rem",
         box_shadow="0 4px 20px rgba(0,0,0,0.08)",
         _hover={
@@ -116,6 +89,7 @@ def service_card(emoji: str, title: str, description: str) -> rx.Component:
     )
 
 
+@rx.memo
 def stat_card(value: str, label: str) -> rx.Component:
     """A statistics card"""
     return rx.box(
@@ -124,7 +98,7 @@ def stat_card(value: str, label: str) -> rx.Component:
                 value,
                 font_size="2rem",
                 font_weight="bold",
-                background=ThemeState.gradient_style,
+                background="var(--ilitia-gradient)",
                 background_clip="text",
                 style={"-webkit-background-clip": "text", "-webkit-text-fill-color": "transparent"},
             ),
@@ -136,7 +110,7 @@ def stat_card(value: str, label: str) -> rx.Component:
             spacing="1",
             align="center",
         ),
-        background=ThemeState.theme.card_background,
+        background="var(--ilitia-card)",
         padding="1.5rem 2rem",
         border_radius="1rem",
         box_shadow="0 4px 20px rgba(0,0,0,0.08)",
@@ -146,26 +120,27 @@ def stat_card(value: str, label: str) -> rx.Component:
     )
 
 
-def testimonial_card(quote: str, author: str, role: str) -> rx.Component:
+@rx.memo
+def testimonial_card(emoji: str, quote: str, author: str, role: str) -> rx.Component:
     """A testimonial card"""
     return rx.box(
         rx.vstack(
-            rx.text(ThemeState.theme.hero_emoji, font_size="1.5rem"),
+            rx.text(emoji, font_size="1.5rem"),
             rx.text(
                 quote,
                 font_size="0.95rem",
-                color=ThemeState.theme.text_color,
+                color="var(--ilitia-text)",
                 font_style="italic",
                 text_align="center",
                 line_height="1.6",
             ),
-            rx.divider(width="50px", border_color=ThemeState.theme.primary_color),
+            rx.divider(width="50px", border_color="var(--ilitia-primary)"),
             rx.vstack(
                 rx.text(
                     author,
                     font_weight="600",
                     font_size="0.9rem",
-                    color=ThemeState.theme.text_color,
+                    color="var(--ilitia-text)",
                 ),
                 rx.text(
                     role,
@@ -179,32 +154,46 @@ def testimonial_card(quote: str, author: str, role: str) -> rx.Component:
             align="center",
             padding="2rem",
         ),
-        background=ThemeState.theme.card_background,
+        background="var(--ilitia-card)",
         border_radius="1rem",
         box_shadow="0 4px 20px rgba(0,0,0,0.08)",
         border_left=f"4px solid",
-        border_left_color=ThemeState.theme.primary_color,
+        border_left_color="var(--ilitia-primary)",
         width="100%",
         style={"transition": "all 0.3s ease"},
     )
 
 
-def cta_button() -> rx.Component:
+@rx.memo
+def cta_button(emoji: str) -> rx.Component:
     """Call to action button"""
-    return rx.button(
-        rx.hstack(
-            rx.text(ThemeState.theme.hero_emoji),
-            rx.text("Comenzar Ahora"),
-            rx.icon("arrow-right", size=18),
-            spacing="2",
+    return rx.el.button(
+        rx.el.span(emoji),
+        rx.el.span("Comenzar Ahora"),
+        rx.icon("arrow-right", size=18),
+        class_name="ilitia-cta",
+    )
+
+
+@rx.memo
+def demo_cards_static() -> rx.Component:
+    """
+    The stats grid: fixed copy themed only through the --ilitia-* CSS variables.
+    
+    Memoized without props, so ThemeState updates never re-render it.
+    """
+    return rx.box(
+        rx.flex(
+            stat_card(value="+150", label="Proyectos"),
+            stat_card(value="+50", label="Clientes"),
+            stat_card(value="+10", label="Años"),
+            stat_card(value="24/7", label="Soporte"),
+            gap="1rem",
+            flex_wrap="wrap",
+            justify="center",
         ),
-        size="3",
-        background=ThemeState.gradient_style,
-        color="white",
-        cursor="pointer",
-        _hover={"opacity": "0.9", "transform": "scale(1.02)"},
-        style={"transition": "all 0.2s ease"},
-        padding_x="2rem",
+        width="100%",
+        padding_y="1rem",
     )
 
 
@@ -222,24 +211,24 @@ def demo_cards() -> rx.Component:
                 "Nuestros Servicios",
                 font_size="1.5rem",
                 font_weight="bold",
-                color=ThemeState.theme.text_color,
+                color="var(--ilitia-text)",
                 margin_bottom="1rem",
             ),
             rx.flex(
                 service_card(
-                    ThemeState.theme.service_emojis[0],
-                    "Inteligencia Artificial",
-                    "Soluciones de IA personalizadas para tu negocio",
+                    emoji=ThemeState.theme.service_emojis[0],
+                    title="Inteligencia Artificial",
+                    description="Soluciones de IA personalizadas para tu negocio",
                 ),
                 service_card(
-                    ThemeState.theme.service_emojis[1],
-                    "Desarrollo Software",
-                    "Aplicaciones modernas con las últimas tecnologías",
+                    emoji=ThemeState.theme.service_emojis[1],
+                    title="Desarrollo Software",
+                    description="Aplicaciones modernas con las últimas tecnologías",
                 ),
                 service_card(
-                    ThemeState.theme.service_emojis[2],
-                    "Consultoría",
-                    "Asesoramiento experto para tu transformación digital",
+                    emoji=ThemeState.theme.service_emojis[2],
+                    title="Consultoría",
+                    description="Asesoramiento experto para tu transformación digital",
                 ),
                 gap="1.5rem",
                 flex_wrap="wrap",
@@ -249,20 +238,8 @@ def demo_cards() -> rx.Component:
             padding_y="2rem",
         ),
         
-        # Stats Section
-        rx.box(
-            rx.flex(
-                stat_card("+150", "Proyectos"),
-                stat_card("+50", "Clientes"),
-                stat_card("+10", "Años"),
-                stat_card("24/7", "Soporte"),
-                gap="1rem",
-                flex_wrap="wrap",
-                justify="center",
-            ),
-            width="100%",
-            padding_y="1rem",
-        ),
+        # Stats Section (static copy, memoized)
+        demo_cards_static(),
         
         # Testimonial
         rx.box(
@@ -270,14 +247,15 @@ def demo_cards() -> rx.Component:
                 "Lo que dicen nuestros clientes",
                 font_size="1.5rem",
                 font_weight="bold",
-                color=ThemeState.theme.text_color,
+                color="var(--ilitia-text)",
                 margin_bottom="1rem",
                 text_align="center",
             ),
             testimonial_card(
-                "Ilitia transformó completamente nuestra manera de trabajar. Su equipo de IA nos ayudó a automatizar procesos que antes nos tomaban días.",
-                "María García",
-                "CTO, TechCorp",
+                emoji=ThemeState.theme.hero_emoji,
+                quote="Ilitia transformó completamente nuestra manera de trabajar. Su equipo de IA nos ayudó a automatizar procesos que antes nos tomaban días.",
+                author="María García",
+                role="CTO, TechCorp",
             ),
             width="100%",
             max_width="600px",
@@ -286,7 +264,7 @@ def demo_cards() -> rx.Component:
         
         # CTA
         rx.center(
-            cta_button(),
+            cta_button(emoji=ThemeState.theme.hero_emoji),
             width="100%",
             padding_y="2rem",
         ),
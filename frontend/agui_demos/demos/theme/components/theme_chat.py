@@ -8,6 +8,8 @@ import reflex as rx
 
 from ..state import ThemeState, ThemeChatMessage
 
+_BUBBLE_TAIL_STYLE = {"--bubble-tail-radius": "0.2rem"}
+
 
 def message_bubble(message: ThemeChatMessage) -> rx.Component:
     """A single message bubble in the chat"""
@@ -17,23 +19,20 @@ def message_bubble(message: ThemeChatMessage) -> rx.Component:
                 message.content,
                 class_name="message-content",
             ),
-            background=rx.cond(
-                message.role == "user",
-                ThemeState.gradient_style,
-                "#f5f5f5"
-            ),
-            color=rx.cond(message.role == "user", "white", "black"),
             padding="0.6rem 0.9rem",
             border_radius="0.75rem",
-            border_bottom_right_radius=rx.cond(message.role == "user", "0.2rem", "0.75rem"),
-            border_bottom_left_radius=rx.cond(message.role == "user", "0.75rem", "0.2rem"),
             max_width="90%",
             font_size="0.85rem",
             box_shadow="0 1px 4px rgba(0,0,0,0.06)",
+            class_name="bubble-body",
+            style=_BUBBLE_TAIL_STYLE,
         ),
         display="flex",
-        justify_content=rx.cond(message.role == "user", "flex-end", "flex-start"),
         width="100%",
+        # Role colors, alignment and the tail corner come from the shared
+        # .bubble-user / .bubble-assistant rules (user color themed below
+        # #theme-chat-messages)
+        class_name=f"bubble-{message.role}",
         padding_y="0.15rem",
     )
 
@@ -44,30 +43,7 @@ def loading_indicator() -> rx.Component:
         ThemeState.is_loading & ~ThemeState.is_streaming,
         rx.box(
             rx.box(
-                rx.hstack(
-                    rx.box(
-                        width="8px",
-                        height="8px",
-                        border_radius="50%",
-                        background="#888",
-                        class_name="loading-dot dot-1",
-                    ),
-                    rx.box(
-                        width="8px",
-                        height="8px",
-                        border_radius="50%",
-                        background="#888",
-                        class_name="loading-dot dot-2",
-                    ),
-                    rx.box(
-                        width="8px",
-                        height="8px",
-                        border_radius="50%",
-                        background="#888",
-                        class_name="loading-dot dot-3",
-                    ),
-                    spacing="1",
-                ),
+                rx.box(class_name="loading-dots"),
                 background="#f5f5f5",
                 padding="0.8rem 1rem",
                 border_radius="0.75rem",
@@ -91,8 +67,11 @@ def streaming_indicator() -> rx.Component:
             rx.box(
                 rx.cond(
                     ThemeState.current_streaming_content != "",
-                    rx.markdown(
+                    # Plain text while tokens arrive; the finished message is
+                    # rendered as markdown once, by message_bubble
+                    rx.text(
                         ThemeState.current_streaming_content,
+                        white_space="pre-wrap",
                         font_size="0.85rem",
                     ),
                     rx.hstack(
@@ -120,14 +99,20 @@ def streaming_indicator() -> rx.Component:
 def chat_input() -> rx.Component:
     """Chat input field with send button"""
     return rx.hstack(
-        rx.input(
-            value=ThemeState.current_input,
-            on_change=ThemeState.set_input,
-            placeholder="Describe tu estilo... (ej: fan del Real Madrid)",
-            width="100%",
-            size="2",
-            radius="large",
-            on_key_down=ThemeState.handle_key_down,
+        # Debounced: the input syncs to the server after a typing pause rather
+        # than per keystroke. Enter and blur flush pending text first, so
+        # handle_key_down and the send button see the full input.
+        rx.debounce_input(
+            rx.input(
+                value=ThemeState.current_input,
+                on_change=ThemeState.set_input,
+                placeholder="Describe tu estilo... (ej: fan del Real Madrid)",
+                width="100%",
+                size="2",
+                radius="large",
+                on_key_down=ThemeState.handle_key_down,
+            ),
+            debounce_timeout=250,
         ),
         rx.icon_button(
             rx.icon("arrow-up", size=16),
@@ -135,7 +120,7 @@ def chat_input() -> rx.Component:
             disabled=ThemeState.is_loading,
             size="2",
             radius="full",
-            background=ThemeState.gradient_style,
+            background="var(--ilitia-gradient)",
             cursor="pointer",
         ),
         spacing="2",
@@ -228,25 +213,12 @@ def chat_panel() -> rx.Component:
 
 def floating_chat_button() -> rx.Component:
     """The floating button to toggle chat"""
-    return rx.box(
-        rx.icon_button(
-            rx.icon("message-circle", size=24),
-            size="4",
-            radius="full",
-            background=ThemeState.gradient_style,
-            box_shadow="0 4px 20px rgba(102, 126, 234, 0.4)",
-            cursor="pointer",
-            on_click=ThemeState.toggle_chat,
-            _hover={
-                "transform": "scale(1.05)",
-                "box_shadow": "0 6px 25px rgba(102, 126, 234, 0.5)",
-            },
-            style={"transition": "all 0.2s ease"},
-        ),
-        position="fixed",
-        bottom="24px",
-        right="24px",
-        z_index="1000",
+    return rx.el.button(
+        rx.icon("message-circle", size=24),
+        on_click=ThemeState.toggle_chat,
+        aria_label="Abrir chat",
+        # Static rules in assets/ilitia.css
+        class_name="ilitia-fab",
     )
 
 
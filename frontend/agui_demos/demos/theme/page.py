@@ -62,7 +62,7 @@ def main_content() -> rx.Component:
         ),
         width="100%",
         min_height="100vh",
-        background=ThemeState.theme.background_color,
+        background="var(--ilitia-bg)",
         margin_left="240px",  # Space for sidebar
         padding_top="2rem",
         padding_right="420px",  # Space for chat panel when open
@@ -84,6 +84,16 @@ def theme_page() -> rx.Component:
         theme_chat(),
         
         min_height="100vh",
-        background=ThemeState.theme.background_color,
-        style={"transition": "background-color 0.5s ease"},
+        background="var(--ilitia-bg)",
+        # The theme is published once here as CSS custom properties; everything
+        # below references var(--ilitia-*) so a theme change is a single style write
+        style={
+            "transition": "background-color 0.5s ease",
+            "--ilitia-primary": ThemeState.theme.primary_color,
+            "--ilitia-secondary": ThemeState.theme.secondary_color,
+            "--ilitia-gradient": ThemeState.gradient_style,
+            "--ilitia-bg": ThemeState.theme.background_color,
+            "--ilitia-card": ThemeState.theme.card_background,
+            "--ilitia-text": ThemeState.theme.text_color,
+        },
     )
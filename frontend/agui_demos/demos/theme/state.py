@@ -5,21 +5,41 @@ This module defines the theme state and handles AG-UI events
 to update the UI styling in real-time.
 """
 
+import logging
 import os
+import time
 import asyncio
-import hashlib
-import json
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Optional
 
 import reflex as rx
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-from ...shared.ag_ui_client import AGUIClient, AGUIClientConfig, AGUIEventType
+from ...shared.ag_ui_client import (
+    AGUIClient,
+    AGUIClientConfig,
+    AGUIEventType,
+    get_shared_http_client,
+)
+from ...shared.chat import STREAM_FLUSH_INTERVAL, append_capped
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Theme agent location, resolved once at import: AGENT_URL points at the
+# recipe agent, so swap its shared_state path for theme_state
+_AGENT_BASE_URL, _AGENT_ENDPOINT = (
+    os.getenv("AGENT_URL", "http://localhost:8888/shared_state")
+    .replace("/shared_state", "/theme_state")
+    .rsplit("/", 1)
+)
+_AGENT_ENDPOINT = f"/{_AGENT_ENDPOINT}"
+logger.debug("🎨 Theme Agent URL: %s%s", _AGENT_BASE_URL, _AGENT_ENDPOINT)
+
 
 class Theme(BaseModel):
     """Theme configuration model for page personalization"""
@@ -39,8 +59,50 @@ class Theme(BaseModel):
     hero_pattern: str = "none"  # Pattern style: none, dots, waves, geometric
 
 
-class ThemeChatMessage(BaseModel):
-    """Chat message model for theme demo"""
+_THEME_FIELDS = frozenset(Theme.model_fields)
+
+
+def _merge_theme(theme: Theme, theme_data: dict[str, Any]) -> Theme:
+    """
+    Return a copy of theme with the known fields from theme_data applied.
+    
+    The payload was already validated against the tool schema by the agent
+    backend, so it is applied with model_copy instead of re-running validation.
+    """
+    return theme.model_copy(
+        update={key: value for key, value in theme_data.items() if key in _THEME_FIELDS}
+    )
+
+
+@lru_cache(maxsize=32)
+def _build_gradient(primary_color: str, secondary_color: str) -> str:
+    """CSS gradient from primary to secondary color (cached per color pair)"""
+    return f"linear-gradient(135deg, {primary_color} 0%, {secondary_color} 100%)"
+
+
+_DEFAULT_GRADIENT = _build_gradient(Theme().primary_color, Theme().secondary_color)
+
+
+def _build_theme_client() -> AGUIClient:
+    """
+    AG-UI client for the theme agent.
+    
+    Built per run: AGUIClient keeps per-run message state, so it can't be
+    shared between sessions. Only the connection pool is shared.
+    """
+    return AGUIClient(
+        AGUIClientConfig(
+            base_url=_AGENT_BASE_URL,
+            endpoint=_AGENT_ENDPOINT,
+            timeout=120.0,
+            http_client=get_shared_http_client(),
+        )
+    )
+
+
+@dataclass(slots=True)
+class ThemeChatMessage:
+    """Chat message model for theme demo (plain dataclass: no validation per message)"""
     role: str = "user"
     content: str = ""
 
@@ -61,7 +123,15 @@ class ThemeState(rx.State):
     
     # Theme state (from AG-UI STATE_SNAPSHOT/STATE_DELTA)
     theme: Theme = Theme()
-    _last_theme_hash: str = ""
+    # CSS gradient from the theme colors; a plain field updated with the theme
+    # (see _set_theme) rather than a computed var re-evaluated on every change
+    gradient_style: str = _DEFAULT_GRADIENT
+    # Whether a customized theme is applied; also maintained by _set_theme
+    has_theme: bool = False
+    _last_theme_data: dict[str, Any] = {}
+    # Serialized theme sent to the agent; refreshed by _set_theme so a send
+    # doesn't re-dump the model. Treat as read-only.
+    _theme_payload: dict[str, Any] = Theme().model_dump()
     
     # UI state
     is_loading: bool = False
@@ -73,16 +143,6 @@ class ThemeState(rx.State):
     # Agent configuration
     thread_id: str = "theme-default"
     
-    @rx.var
-    def has_theme(self) -> bool:
-        """Check if we have a customized theme"""
-        return self.theme.mood != "Corporativo - Ilitia"
-    
-    @rx.var
-    def gradient_style(self) -> str:
-        """CSS gradient from primary to secondary colors"""
-        return f"linear-gradient(135deg, {self.theme.primary_color} 0%, {self.theme.secondary_color} 100%)"
-    
     @rx.var
     def message_count(self) -> int:
         """Number of messages in chat"""
@@ -90,6 +150,8 @@ class ThemeState(rx.State):
     
     def set_input(self, value: str):
         """Update the current input value"""
+        if value == self.current_input:
+            return
         self.current_input = value
     
     def clear_error(self):
@@ -105,23 +167,28 @@ class ThemeState(rx.State):
         if key == "Enter":
             return ThemeState.send_message
     
+    def _set_theme(self, theme: Theme):
+        """Replace the theme and the fields derived from it"""
+        self.theme = theme
+        self.gradient_style = _build_gradient(theme.primary_color, theme.secondary_color)
+        self.has_theme = theme.mood != "Corporativo - Ilitia"
+        self._theme_payload = theme.model_dump()
+    
     def reset_theme(self):
         """Reset to default theme"""
-        self.theme = Theme()
-        self.messages = []
+        self._set_theme(Theme())
+        self.messages.clear()
         self.current_input = ""
-        self._last_theme_hash = ""
+        self._last_theme_data = {}
     
-    def _get_agent_url(self) -> str:
-        """Get the theme agent backend URL from environment"""
-        base_url = os.getenv("AGENT_URL", "http://localhost:8888/shared_state")
-        # Replace shared_state with theme_state for theme agent
-        return base_url.replace("/shared_state", "/theme_state")
+    def _add_message(self, role: str, content: str):
+        """Append a chat message, dropping the oldest ones beyond MAX_CHAT_MESSAGES"""
+        append_capped(self.messages, ThemeChatMessage(role=role, content=content))
     
     def _build_state_for_agent(self) -> dict:
         """Build the current state to send to the agent"""
         return {
-            "theme": self.theme.model_dump()
+            "theme": self._theme_payload
         }
     
     async def send_message(self):
@@ -133,9 +200,7 @@ class ThemeState(rx.State):
         self.current_input = ""
         
         # Add user message to chat
-        self.messages = self.messages + [
-            ThemeChatMessage(role="user", content=user_message)
-        ]
+        self._add_message("user", user_message)
         
         self.is_loading = True
         self.is_streaming = False
@@ -149,20 +214,11 @@ class ThemeState(rx.State):
         yield
         
         try:
-            agent_url = self._get_agent_url()
-            print(f"🎨 Theme Agent URL: {agent_url}")
-            
-            config = AGUIClientConfig(
-                base_url=agent_url.rsplit("/", 1)[0],
-                endpoint=f"/{agent_url.rsplit('/', 1)[1]}",
-                timeout=120.0,
-            )
-            print(f"🎨 Config: base={config.base_url}, endpoint={config.endpoint}")
-            
-            client = AGUIClient(config)
+            client = _build_theme_client()
             
             # Current state to send
             current_state = self._build_state_for_agent()
+            last_flush = 0.0
             
             async for event in client.run(
                 message=user_message,
@@ -178,16 +234,16 @@ class ThemeState(rx.State):
                     # Handle both 'delta' and 'content' keys
                     delta = event.data.get("delta", event.data.get("content", ""))
                     self.current_streaming_content += delta
-                    yield
+                    # Throttle token updates; any other event (or the end of the
+                    # message) yields and flushes what is pending
+                    now = time.monotonic()
+                    if now - last_flush >= STREAM_FLUSH_INTERVAL:
+                        last_flush = now
+                        yield
                     
                 elif event.type == AGUIEventType.TEXT_MESSAGE_END:
                     if self.current_streaming_content:
-                        self.messages = self.messages + [
-                            ThemeChatMessage(
-                                role="assistant",
-                                content=self.current_streaming_content
-                            )
-                        ]
+                        self._add_message("assistant", self.current_streaming_content)
                     self.is_streaming = False
                     self.current_streaming_content = ""
                     yield
@@ -197,31 +253,15 @@ class ThemeState(rx.State):
                     snapshot_data = event.data.get("snapshot", event.data.get("state", {}))
                     theme_data = snapshot_data.get("theme")
                     
-                    if theme_data and isinstance(theme_data, dict):
-                        # Check if theme actually changed
-                        theme_content = json.dumps(theme_data, sort_keys=True)
-                        current_hash = hashlib.md5(theme_content.encode()).hexdigest()
+                    # Only apply the theme when it differs from the last snapshot
+                    # (plain dict equality, no re-serialization)
+                    if theme_data and isinstance(theme_data, dict) and theme_data != self._last_theme_data:
+                        self._last_theme_data = theme_data
                         
-                        if current_hash != self._last_theme_hash:
-                            old_mood = self.theme.mood
-                            self._last_theme_hash = current_hash
-                            
-                            # Update theme with all fields including new visual elements
-                            self.theme = Theme(
-                                primary_color=theme_data.get("primary_color", self.theme.primary_color),
-                                secondary_color=theme_data.get("secondary_color", self.theme.secondary_color),
-                                background_color=theme_data.get("background_color", self.theme.background_color),
-                                card_background=theme_data.get("card_background", self.theme.card_background),
-                                text_color=theme_data.get("text_color", self.theme.text_color),
-                                accent_color=theme_data.get("accent_color", self.theme.accent_color),
-                                font_family=theme_data.get("font_family", self.theme.font_family),
-                                mood=theme_data.get("mood", self.theme.mood),
-                                description=theme_data.get("description", self.theme.description),
-                                hero_emoji=theme_data.get("hero_emoji", self.theme.hero_emoji),
-                                service_emojis=theme_data.get("service_emojis", self.theme.service_emojis),
-                                background_image=theme_data.get("background_image", self.theme.background_image),
-                                hero_pattern=theme_data.get("hero_pattern", self.theme.hero_pattern),
-                            )
+                        # Update theme with all fields including new visual elements
+                        self._set_theme(_merge_theme(self.theme, theme_data))
+                    # Yield even for an unchanged snapshot: it flushes text held
+                    # back by the token throttle
                     yield
                     
                 elif event.type == AGUIEventType.RUN_ERROR:
@@ -236,8 +276,7 @@ class ThemeState(rx.State):
                     
         except Exception as e:
             self.error_message = f"Error de conexión: {str(e)}"
-            print(f"🎨 ERROR: {e}")
+            logger.error("🎨 Theme agent request failed: %s", e)
             self.is_loading = False
             self.is_streaming = False
             yield
-            yield
@@ -2,7 +2,15 @@
 Shared components and utilities for AG-UI demos.
 """
 
-from .ag_ui_client import AGUIClient, AGUIClientConfig, AGUIEvent, AGUIEventType
+from .ag_ui_client import (
+    AGUIClient,
+    AGUIClientConfig,
+    AGUIEvent,
+    AGUIEventType,
+    get_shared_http_client,
+)
+from .chat import MAX_CHAT_MESSAGES, STREAM_FLUSH_INTERVAL, append_capped
+from .markdown import chat_markdown, markdown_block, split_markdown_blocks
 from .sidebar import sidebar
 
 __all__ = [
@@ -10,5 +18,12 @@ __all__ = [
     "AGUIClientConfig", 
     "AGUIEvent",
     "AGUIEventType",
+    "get_shared_http_client",
+    "MAX_CHAT_MESSAGES",
+    "STREAM_FLUSH_INTERVAL",
+    "append_capped",
+    "chat_markdown",
+    "markdown_block",
+    "split_markdown_blocks",
     "sidebar",
 ]
@@ -6,12 +6,31 @@ It handles the streaming connection and event parsing for the AG-UI protocol.
 """
 
 import json
+import time
+import uuid
 import asyncio
+import inspect
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, AsyncIterator, Callable, Optional
 from enum import Enum
 
 import httpx
+from httpx_sse import aconnect_sse
+
+# orjson (the optional "speedups" extra) parses SSE payloads several times
+# faster than the stdlib; its decode error subclasses json.JSONDecodeError
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# uvloop (also in "speedups", not available on Windows) runs run_sync's event
+# loop on libuv, which handles a stream of small SSE frames with less overhead
+try:
+    from uvloop import run as _run_event_loop
+except ImportError:
+    _run_event_loop = asyncio.run
 
 
 class AGUIEventType(str, Enum):
@@ -37,7 +56,12 @@ class AGUIEventType(str, Enum):
     CUSTOM = "CUSTOM"
 
 
-@dataclass
+# Wire value -> member, so event parsing is a dict lookup rather than an Enum
+# call that raises for unknown types
+_EVENT_TYPE_MAP = {event_type.value: event_type for event_type in AGUIEventType}
+
+
+@dataclass(slots=True)
 class AGUIEvent:
     """Represents an AG-UI protocol event"""
     type: AGUIEventType
@@ -47,20 +71,19 @@ class AGUIEvent:
     @classmethod
     def from_dict(cls, data: dict) -> "AGUIEvent":
         """Create an AGUIEvent from a dictionary"""
-        event_type_str = data.get("type", "CUSTOM")
-        try:
-            event_type = AGUIEventType(event_type_str)
-        except ValueError:
-            event_type = AGUIEventType.CUSTOM
-        
         return cls(
-            type=event_type,
+            type=_EVENT_TYPE_MAP.get(data.get("type"), AGUIEventType.CUSTOM),
             data=data,
             timestamp=data.get("timestamp", "")
         )
 
 
-@dataclass
+def _text_delta(data: dict) -> str:
+    """Text of a TEXT_MESSAGE_CONTENT event ("delta" per AG-UI, "content" in older servers)"""
+    return data.get("delta") or data.get("content", "")
+
+
+@dataclass(slots=True)
 class AGUIMessage:
     """Represents a chat message"""
     role: str
@@ -68,12 +91,37 @@ class AGUIMessage:
     message_id: str = ""
 
 
-@dataclass
+# Seconds a health_check result is reused before /health is queried again
+HEALTH_CHECK_TTL = 2.0
+
+# base_url -> (monotonic time, result) of the last health check. Kept at module
+# level because clients are short-lived (the demo states build one per run).
+_health_cache: dict[str, tuple[float, bool]] = {}
+
+
+@lru_cache(maxsize=1)
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide httpx client whose connection pool is shared by every AG-UI client.
+    
+    Connections to the agent backend are kept alive across runs and user
+    sessions instead of being opened (and TLS-negotiated) per request.
+    Per-request timeouts come from each AGUIClientConfig.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+    )
+
+
+@dataclass(slots=True)
 class AGUIClientConfig:
     """Configuration for the AG-UI client"""
     base_url: str = "http://localhost:8888"
     endpoint: str = "/shared_state"
     timeout: float = 300.0  # 5 minutes timeout for long generations
+    # Optional client to send requests through (e.g. get_shared_http_client());
+    # without one, each AGUIClient lazily creates and owns its own.
+    http_client: Optional[httpx.AsyncClient] = None
     
     @property
     def full_url(self) -> str:
@@ -96,7 +144,33 @@ class AGUIClient:
     def __init__(self, config: Optional[AGUIClientConfig] = None):
         self.config = config or AGUIClientConfig()
         self._current_message_id: str = ""
-        self._current_message_content: str = ""
+        self._current_message_chunks: list[str] = []
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def current_message_content(self) -> str:
+        """Text streamed so far for the current assistant message"""
+        return "".join(self._current_message_chunks)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        The httpx client to send requests through, kept for the client's lifetime.
+        
+        Reusing it keeps connections to the agent backend alive between runs.
+        Uses the configured http_client when set; otherwise one is created on
+        first use and released by aclose().
+        """
+        if self.config.http_client is not None:
+            return self.config.http_client
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.config.timeout)
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the httpx client this AGUIClient created, if any"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def run(
         self,
@@ -117,10 +191,8 @@ class AGUIClient:
         Yields:
             AGUIEvent objects as they arrive from the server
         """
-        import uuid
-        
         if not run_id:
-            run_id = str(uuid.uuid4())
+            run_id = uuid.uuid4().hex
         
         # Prepare request payload (AG-UI format)
         payload = {
@@ -132,38 +204,43 @@ class AGUIClient:
             "state": state
         }
         
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            async with client.stream(
-                "POST",
-                self.config.full_url,
-                json=payload,
-                headers={
-                    "Accept": "text/event-stream",
-                    "Content-Type": "application/json"
-                }
-            ) as response:
-                response.raise_for_status()
+        # aconnect_sse sets the SSE request headers and yields whole
+        # frames, with multi-line data fields already joined
+        async with aconnect_sse(
+            self._get_client(),
+            "POST",
+            self.config.full_url,
+            json=payload,
+            timeout=self.config.timeout,
+        ) as event_source:
+            event_source.response.raise_for_status()
+            
+            async for sse in event_source.aiter_sse():
+                try:
+                    data = _json_loads(sse.data)
+                except json.JSONDecodeError:
+                    # Skip malformed (or empty keep-alive) events
+                    continue
+                
+                # Fast path for the per-token event, which dominates the stream:
+                # its type is known, so skip the generic from_dict lookup. Each
+                # event is still a fresh object, as consumers may keep them.
+                if data.get("type") == "TEXT_MESSAGE_CONTENT":
+                    # Chunks are joined on demand rather than concatenated per token
+                    self._current_message_chunks.append(_text_delta(data))
+                    yield AGUIEvent(
+                        AGUIEventType.TEXT_MESSAGE_CONTENT, data, data.get("timestamp", "")
+                    )
+                    continue
+                
+                event = AGUIEvent.from_dict(data)
+                
+                # Track message content
+                if event.type == AGUIEventType.TEXT_MESSAGE_START:
+                    self._current_message_id = event.data.get("messageId", "")
+                    self._current_message_chunks = []
                 
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data_str = line[6:]  # Remove "data: " prefix
-                        
-                        try:
-                            data = json.loads(data_str)
-                            event = AGUIEvent.from_dict(data)
-                            
-                            # Track message content
-                            if event.type == AGUIEventType.TEXT_MESSAGE_START:
-                                self._current_message_id = event.data.get("messageId", "")
-                                self._current_message_content = ""
-                            elif event.type == AGUIEventType.TEXT_MESSAGE_CONTENT:
-                                self._current_message_content += event.data.get("content", "")
-                            
-                            yield event
-                            
-                        except json.JSONDecodeError:
-                            # Skip malformed events
-                            continue
+                yield event
     
     async def run_simple(
         self,
@@ -178,44 +255,39 @@ class AGUIClient:
             "thread_id": thread_id
         }
         
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            async with client.stream(
-                "POST",
-                f"{self.config.base_url}/chat",
-                json=payload,
-                headers={
-                    "Accept": "text/event-stream",
-                    "Content-Type": "application/json"
-                }
-            ) as response:
-                response.raise_for_status()
-                
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data_str = line[6:]
-                        
-                        try:
-                            data = json.loads(data_str)
-                            yield AGUIEvent.from_dict(data)
-                        except json.JSONDecodeError:
-                            continue
+        async with aconnect_sse(
+            self._get_client(),
+            "POST",
+            f"{self.config.base_url}/chat",
+            json=payload,
+            timeout=self.config.timeout,
+        ) as event_source:
+            event_source.response.raise_for_status()
+            
+            async for sse in event_source.aiter_sse():
+                try:
+                    data = _json_loads(sse.data)
+                except json.JSONDecodeError:
+                    continue
+                yield AGUIEvent.from_dict(data)
     
     async def reset(self, thread_id: str = "default") -> bool:
         """Reset the agent state for a thread"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.config.base_url}/reset/{thread_id}"
-            )
-            return response.status_code == 200
+        response = await self._get_client().post(f"{self.config.base_url}/reset/{thread_id}")
+        return response.status_code == 200
     
     async def health_check(self) -> bool:
-        """Check if the agent backend is healthy"""
+        """Check if the agent backend is healthy (cached per base_url for HEALTH_CHECK_TTL seconds)"""
+        cached = _health_cache.get(self.config.base_url)
+        if cached is not None and time.monotonic() - cached[0] < HEALTH_CHECK_TTL:
+            return cached[1]
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.config.base_url}/health")
-                return response.status_code == 200
+            response = await self._get_client().get(f"{self.config.base_url}/health", timeout=5.0)
+            healthy = response.status_code == 200
         except Exception:
-            return False
+            healthy = False
+        _health_cache[self.config.base_url] = (time.monotonic(), healthy)
+        return healthy
 
 
 class AGUIEventHandler:
@@ -229,53 +301,100 @@ class AGUIEventHandler:
         
         async for event in client.run("message"):
             handler.handle(event)
+    
+    Callbacks may also be coroutine functions; dispatch those with
+    handle_async() and await wait() once the stream ends.
     """
     
-    def __init__(self):
-        self._handlers: dict[AGUIEventType, list[Callable]] = {}
+    def __init__(self, max_pending_tasks: int = 8):
+        # Callbacks per event type, as tuples: handle() iterates them with a
+        # single dict lookup and no membership test
+        self._handlers: dict[AGUIEventType, tuple[Callable, ...]] = {}
+        # Bounds the async callbacks in flight (see handle_async)
+        self._task_slots = asyncio.Semaphore(max_pending_tasks)
+        self._tasks: set[asyncio.Task] = set()
+        # Failures of tasks that finished before wait() was called
+        self._errors: list[BaseException] = []
     
     def on(self, event_type: AGUIEventType, callback: Callable) -> "AGUIEventHandler":
         """Register a callback for an event type"""
-        if event_type not in self._handlers:
-            self._handlers[event_type] = []
-        self._handlers[event_type].append(callback)
+        self._handlers[event_type] = self._handlers.get(event_type, ()) + (callback,)
         return self
     
     def on_text_content(self, callback: Callable[[str], None]) -> "AGUIEventHandler":
         """Register callback for text message content"""
         def wrapper(event_data: dict):
-            callback(event_data.get("content", ""))
+            return callback(_text_delta(event_data))
         return self.on(AGUIEventType.TEXT_MESSAGE_CONTENT, wrapper)
     
     def on_state_snapshot(self, callback: Callable[[dict], None]) -> "AGUIEventHandler":
         """Register callback for state snapshots"""
         def wrapper(event_data: dict):
-            callback(event_data.get("state", {}))
+            return callback(event_data.get("state", {}))
         return self.on(AGUIEventType.STATE_SNAPSHOT, wrapper)
     
     def on_state_delta(self, callback: Callable[[list], None]) -> "AGUIEventHandler":
         """Register callback for state deltas"""
         def wrapper(event_data: dict):
-            callback(event_data.get("delta", []))
+            return callback(event_data.get("delta", []))
         return self.on(AGUIEventType.STATE_DELTA, wrapper)
     
     def on_run_finished(self, callback: Callable[[], None]) -> "AGUIEventHandler":
         """Register callback for run completion"""
         def wrapper(event_data: dict):
-            callback()
+            return callback()
         return self.on(AGUIEventType.RUN_FINISHED, wrapper)
     
     def on_error(self, callback: Callable[[str], None]) -> "AGUIEventHandler":
         """Register callback for errors"""
         def wrapper(event_data: dict):
-            callback(event_data.get("error", "Unknown error"))
+            return callback(event_data.get("error", "Unknown error"))
         return self.on(AGUIEventType.RUN_ERROR, wrapper)
     
     def handle(self, event: AGUIEvent):
         """Handle an event by calling registered callbacks"""
-        if event.type in self._handlers:
-            for callback in self._handlers[event.type]:
-                callback(event.data)
+        for callback in self._handlers.get(event.type, ()):
+            callback(event.data)
+    
+    async def handle_async(self, event: AGUIEvent):
+        """
+        Handle an event without waiting for async callbacks to finish.
+        
+        Sync callbacks run inline. Coroutines returned by async callbacks run as
+        background tasks, so reading the stream continues while they work;
+        their relative order is not guaranteed. Once max_pending_tasks are in
+        flight this waits for one to finish, so a slow callback can't pile up
+        tasks without bound.
+        """
+        for callback in self._handlers.get(event.type, ()):
+            result = callback(event.data)
+            if inspect.isawaitable(result):
+                await self._task_slots.acquire()
+                task = asyncio.create_task(self._run_callback(result))
+                self._tasks.add(task)
+                task.add_done_callback(self._on_task_done)
+    
+    async def _run_callback(self, awaitable):
+        try:
+            await awaitable
+        finally:
+            self._task_slots.release()
+    
+    def _on_task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        # Retrieving the exception here also keeps asyncio from logging it
+        # as never retrieved
+        if not task.cancelled() and task.exception() is not None:
+            self._errors.append(task.exception())
+    
+    async def wait(self):
+        """Wait for pending async callbacks, re-raising the first failure"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._errors:
+            error = self._errors[0]
+            self._errors.clear()
+            raise error
 
 
 # Utility functions for synchronous contexts
@@ -289,25 +408,26 @@ def run_sync(
     Synchronous wrapper for running the agent.
     Returns the final state and collected messages.
     """
-    import asyncio
-    
     async def _run():
         config = AGUIClientConfig(base_url=base_url)
         client = AGUIClient(config)
         
         final_state = {}
         messages = []
-        current_content = ""
+        content_chunks: list[str] = []
         
-        async for event in client.run(message, thread_id):
-            if event.type == AGUIEventType.TEXT_MESSAGE_CONTENT:
-                current_content += event.data.get("content", "")
-            elif event.type == AGUIEventType.TEXT_MESSAGE_END:
-                messages.append({"role": "assistant", "content": current_content})
-                current_content = ""
-            elif event.type == AGUIEventType.STATE_SNAPSHOT:
-                final_state = event.data.get("state", {})
+        try:
+            async for event in client.run(message, thread_id):
+                if event.type == AGUIEventType.TEXT_MESSAGE_CONTENT:
+                    content_chunks.append(_text_delta(event.data))
+                elif event.type == AGUIEventType.TEXT_MESSAGE_END:
+                    messages.append({"role": "assistant", "content": "".join(content_chunks)})
+                    content_chunks = []
+                elif event.type == AGUIEventType.STATE_SNAPSHOT:
+                    final_state = event.data.get("state", {})
+        finally:
+            await client.aclose()
         
         return {"state": final_state, "messages": messages}
     
-    return asyncio.run(_run())
+    return _run_event_loop(_run())
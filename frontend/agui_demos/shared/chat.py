@@ -0,0 +1,24 @@
+"""
+Chat Helpers
+
+Limits and helpers shared by the demos' chat states.
+"""
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Keep only the most recent chat messages so long sessions don't grow the
+# state (and the rendered list) without bound
+MAX_CHAT_MESSAGES = 200
+
+# Minimum seconds between UI updates while text streams in. Tokens arriving
+# in between are accumulated in state and sent with the next update.
+STREAM_FLUSH_INTERVAL = 0.05
+
+
+def append_capped(messages: list[T], message: T) -> None:
+    """Append message in place, dropping the oldest ones beyond MAX_CHAT_MESSAGES"""
+    messages.append(message)
+    if len(messages) > MAX_CHAT_MESSAGES:
+        del messages[:-MAX_CHAT_MESSAGES]
@@ -0,0 +1,82 @@
+"""
+Chat Markdown Components
+
+Markdown rendering for chat messages, including helpers to render a
+growing markdown buffer block by block.
+"""
+
+import reflex as rx
+from reflex.components.markdown.markdown import Markdown, _REHYPE_PLUGINS, _REMARK_PLUGINS
+from reflex.vars import Var
+
+# Module-level JS constants for the plugin lists. rx.markdown inlines fresh
+# array literals into every render; these keep the same identity across renders.
+_REMARK_PLUGINS_CONST = Var(_js_expr="CHAT_MD_REMARK_PLUGINS")
+_REHYPE_PLUGINS_CONST = Var(_js_expr="CHAT_MD_REHYPE_PLUGINS")
+
+
+class ChatMarkdown(Markdown):
+    """rx.markdown with its remark/rehype plugin lists hoisted to module scope"""
+
+    def add_custom_code(self) -> list[str]:
+        """Declare the shared plugin lists once per generated module"""
+        return [
+            f"const {_REMARK_PLUGINS_CONST!s} = {_REMARK_PLUGINS!s};",
+            f"const {_REHYPE_PLUGINS_CONST!s} = {_REHYPE_PLUGINS!s};",
+        ]
+
+    def _render(self):
+        return (
+            super()
+            ._render()
+            .add_props(
+                remark_plugins=_REMARK_PLUGINS_CONST,
+                rehype_plugins=_REHYPE_PLUGINS_CONST,
+            )
+        )
+
+
+chat_markdown = ChatMarkdown.create
+
+
+def split_markdown_blocks(text: str) -> list[str]:
+    """
+    Split markdown into top-level blocks at blank lines outside fenced code.
+
+    The last element is always the unfinished tail (raw text, possibly empty)
+    that keeps growing while tokens stream in; the ones before it are complete
+    blocks. Blank lines followed by an indented line (list continuations,
+    indented code) don't end a block. Re-splitting `tail + delta` therefore
+    yields the same blocks as splitting the whole buffer.
+    """
+    blocks: list[str] = []
+    current: list[str] = []
+    in_fence = pending_break = False
+    *lines, partial = text.split("\n")
+    for line in lines:
+        if not line.strip():
+            if current:
+                current.append(line)
+                pending_break = not in_fence
+            continue
+        if pending_break and not line[0].isspace():
+            blocks.append("\n".join(current).rstrip())
+            current = []
+        pending_break = False
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        current.append(line)
+    current.append(partial)
+    blocks.append("\n".join(current))
+    return blocks
+
+
+@rx.memo
+def markdown_block(source: str) -> rx.Component:
+    """
+    A single markdown block.
+
+    Memoized so finished blocks of a streaming message are not re-parsed
+    when tokens are appended to the tail block.
+    """
+    return chat_markdown(source)
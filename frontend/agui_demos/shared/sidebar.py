@@ -7,18 +7,37 @@ A sidebar showing available demos in the application.
 import reflex as rx
 
 
-def demo_item(title: str, description: str, icon: str, href: str, is_active: bool = False) -> rx.Component:
-    """A single demo item in the sidebar"""
+# Static style values for demo_item
+_ACCENT = "#667eea"
+_ACTIVE_BACKGROUND = "rgba(102, 126, 234, 0.1)"
+_HOVER_BACKGROUND = "rgba(102, 126, 234, 0.05)"
+
+
+@rx.memo
+def demo_item(
+    icon: rx.Var[rx.Component],
+    title: str,
+    description: str,
+    href: str,
+    is_active: bool,
+) -> rx.Component:
+    """
+    A single demo item in the sidebar.
+    
+    The icon is passed as a component because rx.icon needs a literal name
+    at compile time, which a memo prop is not.
+    """
     return rx.link(
         rx.box(
             rx.hstack(
-                rx.icon(icon, size=18, color="#667eea" if is_active else "#666"),
+                # Icons draw with currentColor
+                rx.box(icon, color=rx.cond(is_active, _ACCENT, "#666"), display="flex"),
                 rx.vstack(
                     rx.text(
                         title,
-                        font_weight="600" if is_active else "500",
+                        font_weight=rx.cond(is_active, "600", "500"),
                         font_size="0.9rem",
-                        color="#333" if is_active else "#666",
+                        color=rx.cond(is_active, "#333", "#666"),
                     ),
                     rx.text(
                         description,
@@ -35,11 +54,11 @@ def demo_item(title: str, description: str, icon: str, href: str, is_active: boo
             ),
             padding="0.75rem",
             border_radius="0.5rem",
-            background="rgba(102, 126, 234, 0.1)" if is_active else "transparent",
-            border_left=f"3px solid {'#667eea' if is_active else 'transparent'}",
+            background=rx.cond(is_active, _ACTIVE_BACKGROUND, "transparent"),
+            border_left=rx.cond(is_active, f"3px solid {_ACCENT}", "3px solid transparent"),
             cursor="pointer",
             _hover={
-                "background": "rgba(102, 126, 234, 0.05)" if not is_active else "rgba(102, 126, 234, 0.1)",
+                "background": rx.cond(is_active, _ACTIVE_BACKGROUND, _HOVER_BACKGROUND),
             },
             width="100%",
         ),
@@ -49,14 +68,16 @@ def demo_item(title: str, description: str, icon: str, href: str, is_active: boo
     )
 
 
-def sidebar(active_demo: str = "recipe") -> rx.Component:
+@rx.memo
+def sidebar(active_demo: str) -> rx.Component:
     """
     Main sidebar component with demo navigation.
     
     Args:
         active_demo: The currently active demo ("recipe" or "theme")
     
-    Shows available demos that can be selected.
+    Shows available demos that can be selected. Memoized: the sidebar has no
+    state of its own, so it renders once per page.
     """
     return rx.box(
         rx.vstack(
@@ -91,18 +112,18 @@ def sidebar(active_demo: str = "recipe") -> rx.Component:
                 
                 # Recipe Assistant
                 demo_item(
+                    icon=rx.icon("chef-hat", size=18),
                     title="Asistente de Recetas",
                     description="Crea y mejora recetas con IA",
-                    icon="chef-hat",
                     href="/",
                     is_active=(active_demo == "recipe"),
                 ),
                 
                 # Page Personalizer (Ilitia)
                 demo_item(
+                    icon=rx.icon("palette", size=18),
                     title="Personalizador Ilitia",
                     description="Personaliza el tema con IA",
-                    icon="palette",
                     href="/theme",
                     is_active=(active_demo == "theme"),
                 ),